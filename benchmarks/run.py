@@ -0,0 +1,215 @@
+"""Бенчмарки представлений блога на большом наборе данных.
+
+Запуск из корня репозитория::
+
+    python benchmarks/run.py --posts 100000 --comments 1000000
+
+База для бенчмарков хранится в отдельном файле (``--database``) и
+наполняется командой ``seed_blog`` один раз; повторные запуски
+используют её, пока не передан ``--reseed``. Результаты пишутся в JSON,
+чтобы сравнивать прогоны.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--categories', type=int, default=200)
+    parser.add_argument('--locations', type=int, default=500)
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--comments', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument(
+        '--cold', action='store_true',
+        help='Очищать кеш перед каждым запросом.',
+    )
+    parser.add_argument(
+        '--database', type=Path,
+        default=BENCHMARKS_DIR / 'benchmark.sqlite3',
+    )
+    parser.add_argument('--reseed', action='store_true')
+    parser.add_argument(
+        '--output', type=Path,
+        help='Куда записать результаты; по умолчанию benchmarks/results/.',
+    )
+    return parser.parse_args()
+
+
+def setup_django(args):
+    from django.conf import settings
+
+    if args.reseed and args.database.exists():
+        args.database.unlink()
+    settings.DATABASES['default']['NAME'] = str(args.database)
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.QUERY_BUDGET_RAISE = False
+
+    import django
+
+    django.setup()
+
+
+def prepare_data(args):
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    call_command('migrate', verbosity=0)
+    if Post.objects.exists():
+        return
+    call_command(
+        'seed_blog',
+        users=args.users,
+        categories=args.categories,
+        locations=args.locations,
+        posts=args.posts,
+        comments=args.comments,
+        seed=args.seed,
+    )
+
+
+def get_scenarios():
+    from django.db.models import Count
+    from django.test import Client
+    from django.urls import reverse
+
+    from blog.models import Category, Post
+
+    published = Post.objects.published()
+    category = Category.objects.filter(is_published=True).annotate(
+        posts=Count('post')
+    ).order_by('-posts').first()
+    post = published.order_by('-comment_count').first()
+    author = post.author
+    anonymous = Client()
+    logged_in = Client()
+    logged_in.force_login(author)
+    comment = {'text': 'Комментарий из бенчмарка'}
+    return {
+        'index': (anonymous.get, reverse('blog:index'), None),
+        'index_last_page': (
+            anonymous.get,
+            reverse('blog:index') + f'?page={published.count() // 10}',
+            None,
+        ),
+        'category_posts': (
+            anonymous.get,
+            reverse('blog:category_posts', args=[category.slug]),
+            None,
+        ),
+        'profile': (
+            anonymous.get,
+            reverse('blog:profile', args=[author.username]),
+            None,
+        ),
+        'profile_own': (
+            logged_in.get,
+            reverse('blog:profile', args=[author.username]),
+            None,
+        ),
+        'post_detail': (
+            anonymous.get,
+            reverse('blog:post_detail', args=[post.pk]),
+            None,
+        ),
+        'comment_create': (
+            logged_in.post,
+            reverse('blog:add_comment', args=[post.pk]),
+            comment,
+        ),
+    }
+
+
+def measure(request, url, data, repeat, cold):
+    from django.core.cache import cache
+    from django.db import connection
+
+    from core.middleware import QueryCounter
+    from core.timing import get_percentile
+
+    request(url, data)
+    latencies = []
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            response = request(url, data)
+            latencies.append((time.perf_counter() - started) * 1000)
+    if cold:
+        cache.clear()
+    tracemalloc.start()
+    request(url, data)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        'status': response.status_code,
+        'queries': queries.total,
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'p50_ms': round(get_percentile(latencies, 50), 2),
+        'p95_ms': round(get_percentile(latencies, 95), 2),
+        'max_ms': round(latencies[-1], 2),
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+    }
+
+
+def main():
+    args = parse_args()
+    setup_django(args)
+    prepare_data(args)
+
+    import django
+    from django.conf import settings
+
+    from blog.models import Comment, Post
+
+    results = {}
+    for name, (request, url, data) in get_scenarios().items():
+        results[name] = measure(request, url, data, args.repeat, args.cold)
+        print(f'{name:16} {results[name]}')
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'django': django.get_version(),
+        'repeat': args.repeat,
+        'cold_cache': args.cold,
+        'dataset': {
+            'posts': Post.objects.count(),
+            'comments': Comment.objects.count(),
+        },
+        'settings': {
+            name: getattr(settings, name)
+            for name in (
+                'FEED_PAGINATION',
+                'FEED_COUNT',
+                'ANONYMOUS_PAGE_CACHE_TIMEOUT',
+                'POST_CARD_CACHE_TIMEOUT',
+            )
+        },
+        'results': results,
+    }
+    output = args.output or (
+        BENCHMARKS_DIR / 'results' / f'{time.strftime("%Y%m%d-%H%M%S")}.json'
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
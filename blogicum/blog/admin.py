@@ -1,20 +1,146 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db.models.functions import Substr
 
+from core.admin import (
+    CappedInline, InputFilter, LargeTableAdmin, changelist_link
+)
+from core.constants import ADMIN_TEXT_PREVIEW_LENGTH
+from . import bulk
 from .models import Category, Location, Post, Comment
+from .search import search_posts
 
 
-class PostInline(admin.TabularInline):
+class AuthorFilter(InputFilter):
+    title = 'логину автора'
+    parameter_name = 'author'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+
+class TextPreviewMixin:
+    list_deferred_fields = ('text',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            text_preview=Substr('text', 1, ADMIN_TEXT_PREVIEW_LENGTH)
+        )
+
+    @admin.display(description='Текст')
+    def short_text(self, obj):
+        if len(obj.text_preview) < ADMIN_TEXT_PREVIEW_LENGTH:
+            return obj.text_preview
+        return f'{obj.text_preview}…'
+
+
+class PublishActionsMixin:
+    """Действия публикации и снятия с публикации одним ``UPDATE``."""
+
+    actions = (
+        'publish',
+        'unpublish',
+    )
+
+    def bulk_update(self, queryset, **values):
+        raise NotImplementedError
+
+    @admin.action(description='Опубликовать', permissions=('change',))
+    def publish(self, request, queryset):
+        updated = self.bulk_update(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано: {updated}.')
+
+    @admin.action(description='Снять с публикации', permissions=('change',))
+    def unpublish(self, request, queryset):
+        updated = self.bulk_update(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации: {updated}.')
+
+
+class DeleteByAuthorMixin(PublishActionsMixin):
+    actions = PublishActionsMixin.actions + (
+        'delete_by_author',
+    )
+
+    def bulk_delete(self, queryset):
+        raise NotImplementedError
+
+    @admin.action(
+        description='Удалить всё от авторов выбранных',
+        permissions=('delete',),
+    )
+    def delete_by_author(self, request, queryset):
+        deleted = self.bulk_delete(
+            self.model.objects.filter(author__in=queryset.values('author'))
+        )
+        self.message_user(request, f'Удалено: {deleted}.')
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
+
+
+class PostInline(CappedInline):
     model = Post
-    extra = 0
+    fields = (
+        'title',
+        'author',
+        'pub_date',
+        'is_published',
+    )
+    readonly_fields = (
+        'author',
+    )
+    ordering = (
+        '-pub_date',
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
 
 
-class CommentInline(admin.TabularInline):
+class CommentInline(CappedInline):
     model = Comment
-    extra = 0
+    fields = (
+        'text',
+        'author',
+        'created_at',
+        'is_published',
+    )
+    readonly_fields = (
+        'author',
+        'created_at',
+    )
+    ordering = (
+        '-created_at',
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+
+class PostLinkMixin:
+    readonly_fields = (
+        'posts_link',
+    )
+
+    @admin.display(description='Все публикации')
+    def posts_link(self, obj):
+        if obj.pk is None:
+            return '-'
+        field = self.model._meta.model_name
+        count = Post.objects.filter(**{field: obj}).count()
+        return changelist_link(Post, count, **{f'{field}__id__exact': obj.pk})
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(PostLinkMixin, PublishActionsMixin, admin.ModelAdmin):
     inlines = (
         PostInline,
     )
@@ -33,9 +159,12 @@ class LocationAdmin(admin.ModelAdmin):
         'is_published',
     )
 
+    def bulk_update(self, queryset, **values):
+        return bulk.update_related(queryset, 'location', **values)
+
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PostLinkMixin, PublishActionsMixin, admin.ModelAdmin):
     inlines = (
         PostInline,
     )
@@ -58,15 +187,18 @@ class CategoryAdmin(admin.ModelAdmin):
         'is_published',
     )
 
+    def bulk_update(self, queryset, **values):
+        return bulk.update_related(queryset, 'category', **values)
+
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(TextPreviewMixin, DeleteByAuthorMixin, LargeTableAdmin):
     inlines = (
         CommentInline,
     )
     list_display = (
         'title',
-        'text',
+        'short_text',
         'author',
         'location',
         'category',
@@ -76,17 +208,116 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_editable = (
         'is_published',
+    )
+    list_select_related = (
         'author',
         'location',
         'category',
     )
+    autocomplete_fields = (
+        'author',
+        'location',
+        'category',
+    )
+    readonly_fields = (
+        'comments_link',
+    )
     search_fields = (
-        'title__icontains',
-        'text__icontains',
+        'title',
+    )
+    search_help_text = (
+        'Полнотекстовый поиск по заголовку, тексту и комментариям.'
     )
     list_filter = (
-        'author',
+        AuthorFilter,
         'category',
         'location',
         'is_published',
     )
+    action_form = PostActionForm
+    actions = DeleteByAuthorMixin.actions + (
+        'move_to_category',
+    )
+
+    def bulk_update(self, queryset, **values):
+        return bulk.update_posts(queryset, **values)
+
+    def bulk_delete(self, queryset):
+        return bulk.delete_posts(queryset)
+
+    @admin.action(
+        description='Перенести в выбранную категорию',
+        permissions=('change',),
+    )
+    def move_to_category(self, request, queryset):
+        form = PostActionForm(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or not form.cleaned_data['category']:
+            self.message_user(
+                request, 'Выберите категорию.', level=messages.ERROR
+            )
+            return
+        category = form.cleaned_data['category']
+        updated = self.bulk_update(queryset, category=category)
+        self.message_user(
+            request, f'Перенесено в «{category}»: {updated}.'
+        )
+
+    @admin.display(description='Все комментарии')
+    def comments_link(self, obj):
+        if obj.pk is None:
+            return '-'
+        return changelist_link(
+            Comment, obj.comment_count, post__id__exact=obj.pk
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+
+@admin.register(Comment)
+class CommentAdmin(TextPreviewMixin, DeleteByAuthorMixin, LargeTableAdmin):
+    list_display = (
+        'short_text',
+        'post',
+        'author',
+        'created_at',
+        'is_published',
+    )
+    list_editable = (
+        'is_published',
+    )
+    list_select_related = (
+        'post',
+        'author',
+    )
+    autocomplete_fields = (
+        'post',
+        'author',
+    )
+    search_fields = (
+        '=author__username',
+    )
+    search_help_text = 'Поиск по логину автора.'
+    list_filter = (
+        AuthorFilter,
+        'is_published',
+    )
+    ordering = (
+        '-pk',
+    )
+
+    def get_readonly_fields(self, request, obj=None):
+        # Перенос комментария в другую публикацию не обновил бы счётчики,
+        # поисковый индекс и кеши обеих публикаций.
+        if obj is not None:
+            return (*super().get_readonly_fields(request, obj), 'post')
+        return super().get_readonly_fields(request, obj)
+
+    def bulk_update(self, queryset, **values):
+        return bulk.update_comments(queryset, **values)
+
+    def bulk_delete(self, queryset):
+        return bulk.delete_comments(queryset)
@@ -0,0 +1,126 @@
+"""Массовые изменения публикаций и комментариев одним запросом к базе.
+
+``QuerySet.update()`` и ``delete_rows()`` не вызывают сигналы, поэтому
+кеши лент, счётчики комментариев, поисковый индекс и файлы фото
+обновляются здесь явно. Функции возвращают число изменённых строк.
+"""
+from django.db import connections, router, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import INDEX_FEED, category_feed, get_feeds, invalidate_feeds
+from .images import delete_unused_images
+from .models import Comment, Post
+from .search import unindex_posts
+from .tasks import update_search_index
+
+
+def count_comments():
+    """Подзапрос с количеством комментариев публикации ``OuterRef('pk')``."""
+    return Coalesce(Subquery(
+        Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+    ), 0)
+
+
+def delete_rows(queryset):
+    """Удаляет строки ``queryset`` одним ``DELETE ... WHERE pk IN (...)``.
+
+    В отличие от ``QuerySet.delete()`` объекты не загружаются, сигналы
+    не отправляются и каскадное удаление не выполняется. Подзапрос
+    обёрнут в производную таблицу: MySQL не разрешает в ``DELETE``
+    подзапрос к той же таблице напрямую.
+    """
+    connection = connections[router.db_for_write(queryset.model)]
+    quote_name = connection.ops.quote_name
+    opts = queryset.model._meta
+    pk_column = quote_name(opts.pk.column)
+    subquery, params = queryset.order_by().values('pk').query.get_compiler(
+        connection=connection
+    ).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote_name(opts.db_table)} '
+            f'WHERE {pk_column} IN ('
+            f'SELECT {pk_column} FROM ({subquery}) AS {quote_name("ids")})',
+            params,
+        )
+        return cursor.rowcount
+
+
+def update_posts(posts, **values):
+    posts = Post.objects.filter(pk__in=posts.values('pk'))
+    with transaction.atomic():
+        feeds = get_feeds(posts)
+        if 'category' in values:
+            feeds |= {INDEX_FEED, category_feed(values['category'].slug)}
+        updated = posts.update(updated_at=timezone.now(), **values)
+    invalidate_feeds(feeds)
+    return updated
+
+
+def delete_posts(posts):
+    posts = Post.objects.filter(pk__in=posts.values('pk'))
+    with transaction.atomic():
+        feeds = get_feeds(posts)
+        post_ids = list(posts.values_list('pk', flat=True))
+        images = list(
+            posts.exclude(image='').values_list(
+                'image', 'image_variants'
+            ).distinct()
+        )
+        delete_rows(Comment.objects.filter(post__in=posts.values('pk')))
+        deleted = delete_rows(posts)
+        unindex_posts(post_ids)
+        for image_name, variants in images:
+            transaction.on_commit(
+                lambda image_name=image_name, variants=variants:
+                delete_unused_images(image_name, variants)
+            )
+    invalidate_feeds(feeds)
+    return deleted
+
+
+def update_comments(comments, **values):
+    return Comment.objects.filter(pk__in=comments.values('pk')).update(
+        **values
+    )
+
+
+def delete_comments(comments):
+    comments = Comment.objects.filter(pk__in=comments.values('pk'))
+    with transaction.atomic():
+        post_ids = list(
+            comments.order_by().values_list('post_id', flat=True).distinct()
+        )
+        posts = Post.objects.filter(pk__in=post_ids)
+        feeds = get_feeds(posts)
+        deleted = delete_rows(comments)
+        posts.update(
+            comment_count=count_comments(), updated_at=timezone.now()
+        )
+        for post_id in post_ids:
+            update_search_index.delay(post_id)
+    invalidate_feeds(feeds)
+    return deleted
+
+
+def update_related(queryset, field, **values):
+    """Обновляет категории или местоположения и сбрасывает их ленты."""
+    posts = Post.objects.filter(**{f'{field}__in': queryset.values('pk')})
+    with transaction.atomic():
+        feeds = get_feeds(posts) | {INDEX_FEED}
+        if field == 'category':
+            feeds |= {
+                category_feed(slug)
+                for slug in queryset.values_list('slug', flat=True)
+            }
+        updated = queryset.model.objects.filter(
+            pk__in=queryset.values('pk')
+        ).update(updated_at=timezone.now(), **values)
+    invalidate_feeds(feeds)
+    return updated
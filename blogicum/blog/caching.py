@@ -0,0 +1,102 @@
+import hashlib
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+from .models import Post
+
+INDEX_FEED = 'index'
+
+
+def category_feed(slug):
+    return f'category:{slug}'
+
+
+def author_feed(username, own=False):
+    return f'author:{username}:own' if own else f'author:{username}'
+
+
+def feed_count_key(feed):
+    return f'feed_count:{feed}'
+
+
+def feed_generation_key(feed):
+    return f'feed_generation:{feed}'
+
+
+def feed_page_key(feed, path):
+    generation = cache.get_or_set(
+        feed_generation_key(feed), time.time_ns, None
+    )
+    path_hash = hashlib.md5(path.encode()).hexdigest()
+    return f'feed_page:{feed}:{generation}:{path_hash}'
+
+
+def get_feeds(posts):
+    feeds = set()
+    for slug, username in posts.order_by().values_list(
+        'category__slug', 'author__username'
+    ).distinct():
+        feeds.add(INDEX_FEED)
+        feeds.add(author_feed(username))
+        feeds.add(author_feed(username, own=True))
+        if slug:
+            feeds.add(category_feed(slug))
+    return feeds
+
+
+def get_post_feeds(post_id):
+    return get_feeds(Post.objects.filter(pk=post_id))
+
+
+def get_category_feeds(category):
+    return get_feeds(Post.objects.filter(category=category)) | {
+        INDEX_FEED, category_feed(category.slug)
+    }
+
+
+def get_location_feeds(location):
+    return get_feeds(Post.objects.filter(location=location))
+
+
+def get_author_feeds(author, previous_username=None):
+    feeds = get_feeds(Post.objects.filter(author=author)) | {
+        author_feed(author.username), author_feed(author.username, own=True)
+    }
+    if previous_username:
+        feeds |= {
+            author_feed(previous_username),
+            author_feed(previous_username, own=True),
+        }
+    return feeds
+
+
+def invalidate_feeds(feeds):
+    if feeds:
+        cache.delete_many(
+            [feed_count_key(feed) for feed in feeds]
+            + [feed_generation_key(feed) for feed in feeds]
+        )
+
+
+post_card_stats = Counter()
+
+
+def get_version(obj):
+    return obj.updated_at.timestamp() if obj else None
+
+
+def post_card_key(post):
+    """Ключ карточки меняется вместе с публикацией, автором, категорией
+    и местоположением, поэтому строки публикаций при их правке не трогаем.
+    """
+    version = ':'.join(str(part) for part in (
+        post.updated_at.timestamp(),
+        post.comment_count,
+        post.author.username,
+        get_version(post.category),
+        get_version(post.location),
+    ))
+    version_hash = hashlib.md5(version.encode()).hexdigest()
+    return f'post_card:{post.pk}:{version_hash}'
@@ -1,5 +1,7 @@
 from django import forms
 
+from core.forms import LimitedImageField
+
 from .models import Comment, Post
 
 
@@ -8,6 +10,9 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', 'is_published', 'comment_count',)
+        field_classes = {
+            'image': LimitedImageField,
+        }
         widgets = {
             'pub_date': forms.DateTimeInput(
                 attrs={'type': 'datetime-local'},
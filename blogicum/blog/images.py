@@ -0,0 +1,131 @@
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from core.constants import IMAGE_VARIANT_QUALITY, IMAGE_VARIANT_WIDTHS
+
+from .caching import get_post_feeds, invalidate_feeds
+from .models import Post
+
+FORMATS = {'jpeg': 'jpg', 'webp': 'webp'}
+
+
+def make_image_variants(image):
+    """Сохраняет уменьшенные JPEG- и WebP-копии изображения.
+
+    Возвращает словарь для ``Post.image_variants``: имя исходного файла и
+    для каждого размера из ``IMAGE_VARIANT_WIDTHS`` его ширину, высоту и
+    пути к файлам в хранилище.
+    """
+    with image.open('rb') as file, Image.open(file) as original:
+        original = ImageOps.exif_transpose(original).convert('RGB')
+    directory = get_variant_directory(image.name)
+    variants = {'source': image.name}
+    for name, width in IMAGE_VARIANT_WIDTHS.items():
+        resized = original.copy()
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+        variant = {'width': resized.width, 'height': resized.height}
+        for image_format, extension in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(
+                buffer,
+                image_format,
+                quality=IMAGE_VARIANT_QUALITY,
+                optimize=True,
+            )
+            variant[image_format] = image.storage.save(
+                f'{directory}/{name}.{extension}',
+                ContentFile(buffer.getvalue()),
+            )
+        variants[name] = variant
+    return variants
+
+
+def needs_image_variants(post):
+    return bool(post.image) and (
+        post.image_variants.get('source') != post.image.name
+    )
+
+
+def update_image_variants(post):
+    """Строит копии изображения и сохраняет их пути без сигналов модели."""
+    variants = make_image_variants(post.image)
+    updated = Post.objects.filter(pk=post.pk, image=post.image.name).update(
+        image_variants=variants,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        post.image_variants = variants
+        invalidate_feeds(get_post_feeds(post.pk))
+    return variants
+
+
+def get_image_sources(post, size):
+    """Атрибуты ``<img>`` и ``<source>`` для изображения публикации.
+
+    Пока копии не построены (или относятся к прежнему файлу), отдаётся
+    оригинал.
+    """
+    if needs_image_variants(post):
+        return {'src': post.image.url}
+    variants = [
+        post.image_variants[name] for name in IMAGE_VARIANT_WIDTHS
+    ]
+    main = post.image_variants[size]
+    storage = post.image.storage
+    return {
+        'src': storage.url(main['jpeg']),
+        'width': main['width'],
+        'height': main['height'],
+        **{
+            f'{image_format}_srcset': ', '.join(
+                f'{storage.url(variant[image_format])} '
+                f'{variant["width"]}w'
+                for variant in variants
+            )
+            for image_format in FORMATS
+        },
+    }
+
+
+def get_variant_paths(variants):
+    return [
+        variants[name][image_format]
+        for name in IMAGE_VARIANT_WIDTHS if name in variants
+        for image_format in FORMATS
+    ]
+
+
+def get_variant_directory(image_name):
+    """Каталог копий фото: у каждого исходного файла он свой."""
+    stem = posixpath.splitext(posixpath.basename(image_name))[0]
+    return f'post_images/variants/{stem}'
+
+
+def delete_unused_images(image_name, variants):
+    """Удаляет файлы фото и его копий, на которые не ссылается ни один пост.
+
+    Одинаковые загрузки хранятся одним файлом, поэтому ссылки ищутся по
+    индексу на ``Post.image``. Копии лежат в каталоге своего исходного
+    файла, так что ссылаться на них могут только посты с тем же фото.
+    """
+    storage = Post._meta.get_field('image').storage
+    sources = {image_name, variants.get('source')} - {None, ''}
+    references = list(
+        Post.objects.filter(image__in=sources).order_by().values_list(
+            'image', 'image_variants'
+        )
+    )
+    if image_name and image_name not in {name for name, _ in references}:
+        storage.delete(image_name)
+    used_paths = {
+        path
+        for _, other_variants in references
+        for path in get_variant_paths(other_variants)
+    }
+    for path in get_variant_paths(variants):
+        if path not in used_paths:
+            storage.delete(path)
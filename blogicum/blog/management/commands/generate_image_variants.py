@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import needs_image_variants, update_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит уменьшенные копии фото публикаций, для которых их ещё нет '
+        '(например, загруженных до появления копий).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Перестроить копии для всех публикаций с фото.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only(
+            'image', 'image_variants'
+        )
+        created = 0
+        for post in posts.iterator():
+            if options['all'] or needs_image_variants(post):
+                update_image_variants(post)
+                created += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано публикаций: {created}')
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Comment, Post
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций индексировать за раз.',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_index(Post, Comment, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,172 @@
+import io
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+MINUTES_IN_YEAR = 365 * 24 * 60
+MINUTES_IN_WEEK = 7 * 24 * 60
+WORDS = ('блог', 'пост', 'город', 'лето', 'фото', 'день', 'путь', 'море')
+TEXT_POOL_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу случайными пользователями, категориями, '
+        'местоположениями, публикациями и комментариями для нагрузочного '
+        'тестирования. Данные вставляются через bulk_create и '
+        'воспроизводимы при одинаковом --seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--future-ratio',
+            type=float,
+            default=0.05,
+            help='Доля отложенных публикаций.',
+        )
+        parser.add_argument(
+            '--unpublished-ratio',
+            type=float,
+            default=0.05,
+            help='Доля снятых с публикации постов и категорий.',
+        )
+        parser.add_argument(
+            '--images',
+            type=int,
+            default=0,
+            help='Сколько разных синтетических картинок сгенерировать.',
+        )
+        parser.add_argument(
+            '--password',
+            help='Общий пароль пользователей; без него вход по паролю закрыт.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.unpublished_ratio = options['unpublished_ratio']
+        prefix = f'seed{options["seed"]}'
+        started = time.perf_counter()
+        images = self.create_images(prefix, options['images'])
+        password = make_password(options['password'])
+        self.sentences = [
+            ' '.join(self.rng.choices(WORDS, k=8)).capitalize() + '.'
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        with transaction.atomic():
+            user_ids = self.bulk_create(User, (
+                User(
+                    username=f'{prefix}-user{number}',
+                    password=password,
+                )
+                for number in range(options['users'])
+            ))
+            category_ids = self.bulk_create(Category, (
+                Category(
+                    title=f'Категория {number}',
+                    description=f'Описание категории {number}',
+                    slug=f'{prefix}-category-{number}',
+                    is_published=self.is_published(),
+                )
+                for number in range(options['categories'])
+            ))
+            location_ids = self.bulk_create(Location, (
+                Location(
+                    name=f'Местоположение {number}',
+                    is_published=self.is_published(),
+                )
+                for number in range(options['locations'])
+            ))
+            post_ids = self.bulk_create(Post, (
+                Post(
+                    title=f'Публикация {number}',
+                    text=self.get_text(),
+                    pub_date=self.get_pub_date(options['future_ratio']),
+                    is_published=self.is_published(),
+                    author_id=self.rng.choice(user_ids),
+                    category_id=self.rng.choice(category_ids),
+                    location_id=self.rng.choice(location_ids + [None]),
+                    image=self.rng.choice(images) if images else '',
+                )
+                for number in range(options['posts'])
+            ))
+            self.bulk_create(Comment, (
+                Comment(
+                    text=self.get_text(sentences=3),
+                    post_id=self.get_popular(post_ids),
+                    author_id=self.rng.choice(user_ids),
+                )
+                for number in range(options['comments'])
+            ), return_ids=False)
+            call_command('recount_comments', stdout=io.StringIO())
+            call_command('rebuild_search_index', stdout=io.StringIO())
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(user_ids)}, '
+            f'категорий {len(category_ids)}, '
+            f'местоположений {len(location_ids)}, '
+            f'публикаций {len(post_ids)}, '
+            f'комментариев {options["comments"]} '
+            f'за {time.perf_counter() - started:.1f} с.'
+        ))
+
+    def bulk_create(self, model, objects, return_ids=True):
+        ids = []
+        while batch := list(islice(objects, self.batch_size)):
+            created = model.objects.bulk_create(batch)
+            if return_ids:
+                ids.extend(obj.pk for obj in created)
+        return ids
+
+    def is_published(self):
+        return self.rng.random() >= self.unpublished_ratio
+
+    def get_pub_date(self, future_ratio):
+        if self.rng.random() < future_ratio:
+            minutes = self.rng.randint(1, MINUTES_IN_WEEK)
+        else:
+            minutes = -self.rng.randint(1, MINUTES_IN_YEAR)
+        return timezone.now() + timedelta(minutes=minutes)
+
+    def get_text(self, sentences=10):
+        return ' '.join(self.rng.choices(self.sentences, k=sentences))
+
+    def get_popular(self, ids):
+        """Первые объекты выбираются чаще — как популярные публикации."""
+        return ids[int(len(ids) * self.rng.random() ** 3)]
+
+    def create_images(self, prefix, count):
+        if not count:
+            return []
+        from PIL import Image
+
+        names = []
+        for number in range(count):
+            buffer = io.BytesIO()
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            Image.new('RGB', (800, 600), color).save(buffer, 'JPEG')
+            names.append(storages['post_images'].save(
+                f'post_images/{prefix}-{number}.jpg',
+                ContentFile(buffer.getvalue()),
+            ))
+        return names
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-18 17:13
+
+import blog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_image_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.models.get_image_storage, upload_to='post_images', verbose_name='Фото'),
+        ),
+    ]
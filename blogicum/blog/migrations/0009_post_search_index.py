@@ -0,0 +1,31 @@
+from django.db import migrations
+
+from blog.search import SEARCH_TABLE, is_supported, rebuild_index
+
+
+def create_search_index(apps, schema_editor):
+    if not is_supported():
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} '
+        'USING fts5(title, text, comments)'
+    )
+    rebuild_index(
+        apps.get_model('blog', 'Post'), apps.get_model('blog', 'Comment')
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if is_supported():
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
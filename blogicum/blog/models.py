@@ -1,10 +1,11 @@
-from datetime import datetime
-
 from django.contrib.auth import get_user_model
+from django.core.files.storage import storages
 from django.db import models
+from django.utils import timezone
 
 from core.models import WithRelations, PublishedStrModel
 from core.constants import MAX_LEN_CHARFIELD
+from core.utils import get_rounded_now
 
 
 User = get_user_model()
@@ -15,6 +16,10 @@ class Location(PublishedStrModel):
         max_length=MAX_LEN_CHARFIELD,
         verbose_name='Название места'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения',
+    )
 
     class Meta:
         verbose_name = 'местоположение'
@@ -38,6 +43,10 @@ class Category(PublishedStrModel):
             'разрешены символы латиницы, цифры, дефис и подчёркивание.'
         )
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения',
+    )
 
     class Meta:
         verbose_name = 'категория'
@@ -47,6 +56,78 @@ class Category(PublishedStrModel):
         return self.title
 
 
+def get_image_storage():
+    return storages['post_images']
+
+
+class ImageStatus(models.TextChoices):
+    PENDING = 'pending', 'Обрабатывается'
+    READY = 'ready', 'Готово'
+    FAILED = 'failed', 'Ошибка обработки'
+
+
+class PostQuerySet(models.QuerySet):
+    card_fields = (
+        'title',
+        'text',
+        'pub_date',
+        'is_published',
+        'image',
+        'image_variants',
+        'comment_count',
+        'updated_at',
+        'author__username',
+        'location__name',
+        'location__is_published',
+        'location__updated_at',
+        'category__title',
+        'category__slug',
+        'category__is_published',
+        'category__updated_at',
+    )
+
+    @staticmethod
+    def published_filter(now=None):
+        return models.Q(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lt=now or get_rounded_now(),
+        )
+
+    def published(self, now=None):
+        return self.filter(self.published_filter(now))
+
+    def scheduled(self, now=None):
+        """Отложенные публикации, в том числе из скрытых категорий.
+
+        Граница времени та же, что в ``published()``. Нужны, чтобы узнать
+        время ближайшей публикации; без соединения с категориями запрос
+        идёт по частичному индексу ``pub_date``.
+        """
+        return self.filter(
+            is_published=True,
+            pub_date__gte=now or get_rounded_now(),
+        )
+
+    def for_author(self, viewer):
+        """Публикации, которые может видеть ``viewer``: свои — все.
+
+        Время не округляется: страница публикации доступна сразу с её
+        наступлением, даже если ленты покажут её позже.
+        """
+        now = timezone.now()
+        if viewer.is_authenticated:
+            return self.filter(
+                models.Q(author=viewer) | self.published_filter(now)
+            )
+        return self.published(now)
+
+    def with_card_data(self):
+        return self.select_related(
+            'author', 'location', 'category'
+        ).only(*self.card_fields)
+
+
 class Post(WithRelations):
     title = models.CharField(
         max_length=MAX_LEN_CHARFIELD,
@@ -58,7 +139,7 @@ class Post(WithRelations):
             'Если установить дату и время в будущем — '
             'можно делать отложенные публикации.'
         ),
-        default=datetime.now(),
+        default=timezone.now,
     )
     location = models.ForeignKey(
         'Location',
@@ -75,12 +156,59 @@ class Post(WithRelations):
         verbose_name='Категория',
         related_name='%(class)s',
     )
-    image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image = models.ImageField(
+        'Фото',
+        upload_to='post_images',
+        storage=get_image_storage,
+        blank=True,
+        db_index=True,
+    )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото',
+    )
+    image_status = models.CharField(
+        max_length=16,
+        choices=ImageStatus.choices,
+        blank=True,
+        editable=False,
+        verbose_name='Обработка фото',
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        verbose_name='Количество комментариев',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date'],
+                condition=models.Q(is_published=True),
+                name='post_published_pub_date_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date'],
+                condition=models.Q(is_published=True),
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -97,6 +225,12 @@ class Comment(WithRelations):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_at_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text
@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+
+import snowballstemmer
+from django.db import connection
+from django.db.models import Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'blog_post_search'
+WORD = re.compile(r'\w+')
+CYRILLIC = re.compile('[а-я]')
+# Служебные слова не обязаны встречаться в найденной публикации.
+STOP_WORDS = frozenset(
+    'а в во да до за и из или к ко на не ни о об от по при про с со у'
+    ' a an and in of on or the to'.split()
+)
+
+russian_stemmer = snowballstemmer.stemmer('russian')
+english_stemmer = snowballstemmer.stemmer('english')
+
+
+@lru_cache(maxsize=100_000)
+def stem_word(word):
+    if CYRILLIC.search(word):
+        return russian_stemmer.stemWord(word)
+    return english_stemmer.stemWord(word)
+
+
+def stem_text(text):
+    """Текст как строка основ слов: так «постов» находится по «посты»."""
+    words = WORD.findall(text.lower().replace('ё', 'е'))
+    return ' '.join(stem_word(word) for word in words)
+
+
+def is_supported():
+    return connection.vendor == 'sqlite'
+
+
+def get_match_query(query):
+    """Запрос FTS5: все основы слов должны встретиться (как префиксы)."""
+    words = WORD.findall(query.lower().replace('ё', 'е'))
+    return ' '.join(
+        f'"{stem_word(word)}"*' for word in words if word not in STOP_WORDS
+    )
+
+
+def index_posts(posts):
+    """Перестраивает записи индекса для переданных публикаций.
+
+    ``posts`` — итерируемое из кортежей ``(id, title, text, comments)``,
+    где ``comments`` — тексты комментариев.
+    """
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        for post_id, title, text, comments in posts:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id]
+            )
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, text, comments) '
+                'VALUES (%s, %s, %s, %s)',
+                [
+                    post_id,
+                    stem_text(title),
+                    stem_text(text),
+                    stem_text(' '.join(comments)),
+                ],
+            )
+
+
+def get_index_rows(post_model, comment_model, post_ids):
+    comments = {}
+    for post_id, text in comment_model.objects.filter(
+        post_id__in=post_ids
+    ).order_by('pk').values_list('post_id', 'text'):
+        comments.setdefault(post_id, []).append(text)
+    for post_id, title, text in post_model.objects.filter(
+        pk__in=post_ids
+    ).values_list('pk', 'title', 'text'):
+        yield post_id, title, text, comments.get(post_id, [])
+
+
+def reindex_posts(post_model, comment_model, post_ids):
+    """Обновляет индекс для публикаций; удалённые убирает из него."""
+    if not is_supported():
+        return
+    post_ids = list(post_ids)
+    found = set()
+    for row in get_index_rows(post_model, comment_model, post_ids):
+        found.add(row[0])
+        index_posts([row])
+    for post_id in set(post_ids) - found:
+        unindex_post(post_id)
+
+
+def rebuild_index(post_model, comment_model, batch_size=1000):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    post_ids = post_model.objects.order_by('pk').values_list('pk', flat=True)
+    batch = []
+    for post_id in post_ids.iterator():
+        batch.append(post_id)
+        if len(batch) == batch_size:
+            index_posts(get_index_rows(post_model, comment_model, batch))
+            batch = []
+    if batch:
+        index_posts(get_index_rows(post_model, comment_model, batch))
+
+
+def index_comment(post_id, text):
+    """Дописывает комментарий в запись индекса, не перестраивая её.
+
+    Возвращает ``False``, если записи публикации в индексе нет.
+    """
+    if not is_supported():
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET comments = comments || ' ' || %s "
+            'WHERE rowid = %s',
+            [stem_text(text), post_id],
+        )
+        return cursor.rowcount > 0
+
+
+def unindex_post(post_id):
+    unindex_posts([post_id])
+
+
+def unindex_posts(post_ids):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [[post_id] for post_id in post_ids],
+        )
+
+
+def search_posts(queryset, query):
+    """Публикации из ``queryset``, подходящие под поисковый запрос.
+
+    На SQLite ищет по индексу FTS5 и добавляет аннотацию ``rank``
+    (bm25: заголовок важнее текста, текст важнее комментариев; меньше —
+    лучше). На других базах ищет ``icontains`` по заголовку и тексту.
+    """
+    match = get_match_query(query)
+    if not match:
+        return queryset.none()
+    if not is_supported():
+        condition = Q()
+        for word in query.split():
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition).annotate(rank=Value(0))
+    table = queryset.model._meta.db_table
+    return queryset.annotate(rank=RawSQL(
+        f'SELECT bm25({SEARCH_TABLE}, 10.0, 5.0, 1.0) FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        [match],
+    )).filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+        [match],
+    ))
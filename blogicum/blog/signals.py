@@ -0,0 +1,178 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .caching import (get_author_feeds, get_category_feeds,
+                      get_location_feeds, get_post_feeds, invalidate_feeds)
+from .images import delete_unused_images, needs_image_variants
+from .models import Category, Comment, ImageStatus, Location, Post
+from .search import index_comment, unindex_post
+from .tasks import process_post_image, update_search_index
+
+User = get_user_model()
+
+
+def deleted_with_post(origin):
+    """Удаляется ли объект каскадом вместе с публикацией."""
+    if isinstance(origin, QuerySet):
+        return origin.model is Post
+    return isinstance(origin, Post)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        invalidate_feeds(get_post_feeds(instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, origin=None, **kwargs):
+    if deleted_with_post(origin):
+        return
+    Post.objects.filter(
+        pk=instance.post_id,
+        comment_count__gt=0,
+    ).update(comment_count=F('comment_count') - 1)
+    invalidate_feeds(get_post_feeds(instance.post_id))
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_feeds(sender, instance, raw=False, **kwargs):
+    instance._previous_feeds = set()
+    if instance.pk and not raw:
+        instance._previous_feeds = get_post_feeds(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(
+            get_post_feeds(instance.pk)
+            | getattr(instance, '_previous_feeds', set())
+        )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_image(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_image = None
+    if not instance.pk or raw:
+        return
+    if update_fields is None or 'image' in update_fields:
+        instance._previous_image = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('image', 'image_variants').first()
+
+
+@receiver(post_save, sender=Post)
+def release_previous_image(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_image', None)
+    if previous and previous[0] != instance.image.name:
+        transaction.on_commit(lambda: delete_unused_images(*previous))
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_post_image(sender, instance, **kwargs):
+    image_name, variants = instance.image.name, instance.image_variants
+    transaction.on_commit(lambda: delete_unused_images(image_name, variants))
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_processing(sender, instance, raw=False, **kwargs):
+    if raw or not needs_image_variants(instance):
+        return
+    Post.objects.filter(pk=instance.pk).update(
+        image_status=ImageStatus.PENDING
+    )
+    instance.image_status = ImageStatus.PENDING
+    process_post_image.delay(instance.pk)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post_feeds(sender, instance, **kwargs):
+    instance._previous_feeds = get_post_feeds(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    invalidate_feeds(getattr(instance, '_previous_feeds', set()))
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_index.delay(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def index_saved_comment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if not created or not index_comment(instance.post_id, instance.text):
+        update_search_index.delay(instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def index_deleted_comment(sender, instance, origin=None, **kwargs):
+    if not deleted_with_post(origin):
+        update_search_index.delay(instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(get_category_feeds(instance))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_deleted_category_feeds(sender, instance, **kwargs):
+    instance._previous_feeds = get_category_feeds(instance)
+
+
+@receiver(post_save, sender=Location)
+def invalidate_location_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(get_location_feeds(instance))
+
+
+@receiver(pre_delete, sender=Location)
+def remember_deleted_location_feeds(sender, instance, **kwargs):
+    instance._previous_feeds = get_location_feeds(instance)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def invalidate_deleted_feeds(sender, instance, **kwargs):
+    invalidate_feeds(getattr(instance, '_previous_feeds', set()))
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, raw=False, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    instance._previous_username = None
+    if raw or not instance.pk or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    instance._previous_username = User.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, instance, raw=False, **kwargs):
+    previous_username = getattr(instance, '_previous_username', None)
+    if previous_username and previous_username != instance.username:
+        invalidate_feeds(get_author_feeds(instance, previous_username))
@@ -0,0 +1,31 @@
+from core.tasks import task
+
+from .images import needs_image_variants, update_image_variants
+from .models import Comment, ImageStatus, Post
+from .search import reindex_posts
+
+
+def mark_image_failed(post_id):
+    Post.objects.filter(pk=post_id).update(image_status=ImageStatus.FAILED)
+
+
+@task(on_failure=mark_image_failed)
+def process_post_image(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'image', 'image_variants'
+    ).first()
+    if post is None or not post.image:
+        return
+    if not post.image.storage.exists(post.image.name):
+        mark_image_failed(post_id)
+        return
+    if needs_image_variants(post):
+        update_image_variants(post)
+    Post.objects.filter(pk=post_id, image=post.image.name).update(
+        image_status=ImageStatus.READY
+    )
+
+
+@task(unique=True)
+def update_search_index(post_id):
+    reindex_posts(Post, Comment, [post_id])
@@ -0,0 +1,22 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.caching import post_card_key, post_card_stats
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    key = post_card_key(post)
+    card = cache.get(key)
+    if card is None:
+        post_card_stats['misses'] += 1
+        card = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, card, settings.POST_CARD_CACHE_TIMEOUT)
+    else:
+        post_card_stats['hits'] += 1
+    return mark_safe(card)
@@ -0,0 +1,15 @@
+from django import template
+
+from blog.images import get_image_sources
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, size, css_class=''):
+    return {
+        'post': post,
+        'image': get_image_sources(post, size),
+        'css_class': css_class,
+        'sizes': '(max-width: 40rem) 100vw, 40rem' if size == 'card' else '',
+    }
@@ -9,6 +9,11 @@ urlpatterns = [
         views.PostListView.as_view(),
         name='index',
     ),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search',
+    ),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -19,6 +24,11 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name='post_detail',
     ),
+    path(
+        'posts/<int:pk>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments',
+    ),
     path(
         'posts/<int:pk>/edit/',
         views.PostUpdateView.as_view(),
@@ -1,64 +1,124 @@
-from datetime import datetime
-
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.paginator import InvalidPage
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  UpdateView, View)
 
+from .caching import (INDEX_FEED, author_feed, category_feed,
+                      feed_count_key, feed_page_key)
 from .forms import CommentForm, PostForm
 from .models import Category, Comment, Post
-from core.constants import PAGE_SIZE
-from core.mixins import OnlyAuthorMixin
+from .search import search_posts
+from core.constants import COMMENTS_PAGE_SIZE, PAGE_SIZE
+from core.mixins import (AnonymousPageCacheMixin, FeedPaginationMixin,
+                         OnlyAuthorMixin)
+from core.paginators import COUNT_OFF, CursorPaginator
 
 User = get_user_model()
 
 
-class PostListView(ListView):
+def get_comments_page(request, post):
+    paginator = CursorPaginator(
+        post.comment.select_related('author'),
+        COMMENTS_PAGE_SIZE,
+        ordering=('created_at', 'pk'),
+        count_mode=COUNT_OFF,
+    )
+    try:
+        return paginator.page(request.GET.get('cursor'))
+    except InvalidPage as error:
+        raise Http404(str(error))
+
+
+class PostListView(
+    AnonymousPageCacheMixin, FeedPaginationMixin, ListView
+):
     model = Post
     template_name = 'blog/index.html'
-    queryset = Post.objects.select_related(
-        'author', 'location', 'category'
-    ).filter(
-        is_published=True,
-        category__is_published=True,
-        pub_date__lt=datetime.now(),
-    ).annotate(comment_count=Count('comment'))
     ordering = '-pub_date'
     paginate_by = PAGE_SIZE
 
+    def get_queryset(self):
+        return Post.objects.published().with_card_data().order_by(
+            self.ordering
+        )
+
+    def get_count_cache_key(self):
+        return feed_count_key(INDEX_FEED)
+
+    def get_page_cache_key(self):
+        return feed_page_key(INDEX_FEED, self.get_page_cache_path())
+
+    def get_next_publication(self):
+        return Post.objects.scheduled().order_by(
+            'pub_date'
+        ).values_list('pub_date', flat=True).first()
+
+
+class PostSearchView(ListView):
+    template_name = 'blog/search.html'
+    paginate_by = PAGE_SIZE
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(
+            Post.objects.published().with_card_data(), self.query
+        ).order_by('rank', '-pub_date')
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            query=self.query,
+            page_query=urlencode({'q': self.query}) + '&',
+            **kwargs,
+        )
+
 
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
 
     def get_queryset(self):
-        pk = self.kwargs['pk']
-        post = get_object_or_404(Post, pk=pk)
-        current_queryset = super().get_queryset().select_related(
+        return Post.objects.for_author(self.request.user).select_related(
             'category',
             'author',
             'location',
-        ).prefetch_related(
-            'comment',
-        )
-        if self.request.user == post.author:
-            return current_queryset
-        return current_queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=datetime.now(),
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comment.select_related('author')
+        context['comments'] = get_comments_page(self.request, self.object)
         return context
 
 
+class PostCommentsView(View):
+    template_name = 'includes/comments.html'
+
+    def get(self, request, pk):
+        post = get_object_or_404(
+            Post.objects.for_author(request.user).only('pk'), pk=pk
+        )
+        context = {
+            'post': post,
+            'comments': get_comments_page(request, post),
+        }
+        if request.GET.get('format') == 'json':
+            comments = context['comments']
+            return JsonResponse({
+                'html': render_to_string(
+                    self.template_name, context, request=request
+                ),
+                'next_cursor': comments.next_cursor,
+            })
+        return TemplateResponse(request, self.template_name, context)
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -98,7 +158,9 @@ class PostDeleteView(OnlyAuthorMixin, DeleteView):
         )
 
 
-class CategoryListView(ListView):
+class CategoryListView(
+    AnonymousPageCacheMixin, FeedPaginationMixin, ListView
+):
     model = Post
     template_name = 'blog/category.html'
     ordering = '-pub_date'
@@ -110,14 +172,23 @@ class CategoryListView(ListView):
             is_published=True,
             slug=self.kwargs['category_slug']
         )
-        return super().get_queryset().select_related(
-            'author', 'location', 'category'
-        ).filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=datetime.now(),
+        return Post.objects.published().with_card_data().filter(
             category=self.category
-        ).annotate(comment_count=Count('comment'))
+        ).order_by(self.ordering)
+
+    def get_count_cache_key(self):
+        return feed_count_key(category_feed(self.category.slug))
+
+    def get_page_cache_key(self):
+        return feed_page_key(
+            category_feed(self.kwargs['category_slug']),
+            self.get_page_cache_path(),
+        )
+
+    def get_next_publication(self):
+        return Post.objects.scheduled().filter(
+            category__slug=self.kwargs['category_slug'],
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -125,7 +196,9 @@ class CategoryListView(ListView):
         return context
 
 
-class ProfileListlView(ListView):
+class ProfileListlView(
+    AnonymousPageCacheMixin, FeedPaginationMixin, ListView
+):
     model = Post
     template_name = 'blog/profile.html'
     ordering = '-pub_date'
@@ -133,24 +206,31 @@ class ProfileListlView(ListView):
 
     def get_queryset(self):
         username = self.kwargs['username']
-        user = get_object_or_404(User, username=username)
-        current_queryset = super().get_queryset().select_related(
-            'author', 'location', 'category'
+        self.profile = get_object_or_404(User, username=username)
+        self.own_profile = self.request.user == self.profile
+        return Post.objects.filter(author=self.profile).for_author(
+            self.request.user
+        ).with_card_data().order_by(self.ordering)
+
+    def get_count_cache_key(self):
+        return feed_count_key(
+            author_feed(self.kwargs['username'], own=self.own_profile)
         )
-        if self.request.user == user:
-            return current_queryset.filter(author=user).annotate(
-                comment_count=Count('comment')
-            )
-        return current_queryset.filter(
-            author=user,
-            is_published=True,
-            pub_date__lt=datetime.now()
-        ).annotate(comment_count=Count('comment'))
+
+    def get_page_cache_key(self):
+        return feed_page_key(
+            author_feed(self.kwargs['username']),
+            self.get_page_cache_path(),
+        )
+
+    def get_next_publication(self):
+        return Post.objects.scheduled().filter(
+            author__username=self.kwargs['username'],
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        username = self.kwargs['username']
-        context['profile'] = get_object_or_404(User, username=username)
+        context['profile'] = self.profile
         return context
 
 
@@ -198,27 +278,20 @@ class CommentUpdateView(OnlyAuthorMixin, UpdateView):
     context_object_name = 'comment'
     pk_url_kwarg = 'comment_id'
 
-    def get_object(self):
-        comment_id = self.kwargs['comment_id']
-        return get_object_or_404(Comment, pk=comment_id)
-
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'pk': self.object.post.pk}
+            kwargs={'pk': self.object.post_id}
         )
 
 
 class CommentDeleteView(OnlyAuthorMixin, DeleteView):
     model = Comment
     template_name = 'blog/comment.html'
-
-    def get_object(self):
-        comment_id = self.kwargs['comment_id']
-        return get_object_or_404(Comment, pk=comment_id)
+    pk_url_kwarg = 'comment_id'
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'pk': self.object.post.pk}
+            kwargs={'pk': self.object.post_id}
         )
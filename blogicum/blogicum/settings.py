@@ -28,12 +28,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
@@ -68,7 +71,48 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Реплики только для чтения (псевдонимы из DATABASES), с которых
+# GET-запросы к REPLICA_READ_VIEWS читают данные. Локальную реплику
+# SQLite копирует из основной базы manage.py sync_replicas.
+READ_REPLICAS = []
+
+REPLICA_READ_VIEWS = {
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'blog:post_comments',
+    'blog:search',
+}
+
+# Сколько секунд после изменения данных посетитель читает с основной
+# базы, чтобы видеть свои изменения; должно быть больше отставания реплик.
+REPLICA_PIN_SECONDS = 10
+
+REPLICA_PIN_COOKIE = 'pin_primary'
+
+# Сколько секунд хранить в общем кеше данные, прочитанные с реплики.
+REPLICA_CACHE_TIMEOUT = 5
+
+# Кеш лент, счётчиков и карточек должен быть общим для всех процессов
+# сервера: иначе сброс после изменения данных виден только процессу,
+# который его выполнил. Файловый кеш общий для процессов одной машины;
+# при нескольких серверах нужен Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,12 +152,118 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
-STATIC_ROOT = BASE_DIR / 'static'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Своя копия CSS Bootstrap (скачивается командой vendor_bootstrap); пока
+# её нет, стили подключаются с CDN из настроек django-bootstrap5.
+BOOTSTRAP_LOCAL_CSS = 'vendor/bootstrap/bootstrap.min.css'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+MEDIA_URL = '/media/'
+
 MEDIA_ROOT = BASE_DIR / 'media'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # collectstatic добавляет хеш содержимого в имена файлов и кладёт
+    # рядом сжатые .gz/.br копии.
+    'staticfiles': {
+        'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage',
+    },
+    # Фото публикаций: одинаковые загрузки хранятся одним файлом.
+    'post_images': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+}
+
+# Загружаемые файлы проверяются по мере чтения запроса: слишком большие
+# и не картинки отклоняются, не дочитываясь в память или на диск.
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.LimitedUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+MAX_IMAGE_PIXELS = 40_000_000
+
+IMAGE_UPLOAD_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+
+# Сколько секунд браузеры могут кешировать файлы, имя которых задаёт
+# их содержимое.
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+MEDIA_MAX_AGE = 60 * 60
+
+# Кто отдаёт содержимое медиафайлов: None — Django, 'x-sendfile' —
+# Apache/lighttpd по абсолютному пути, 'x-accel-redirect' — nginx по
+# внутреннему адресу MEDIA_ACCEL_REDIRECT_PREFIX + путь к файлу.
+MEDIA_SENDFILE = None
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Сколько SQL-запросов может сделать представление (вместе с загрузкой
+# сессии и пользователя); QUERY_BUDGET_RAISE превращает превышение в ошибку.
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:category_posts': 6,
+    'blog:profile': 6,
+    'blog:post_detail': 4,
+    'blog:post_comments': 4,
+    'blog:search': 6,
+}
+
+QUERY_BUDGET_DEFAULT = 20
+
+QUERY_BUDGET_RAISE = False
+
+# Сколько одинаковых запросов за запрос считать признаком N+1.
+QUERY_REPEAT_THRESHOLD = 5
+
+# Сколько последних замеров времени хранить для каждого представления.
+SERVER_TIMING_SAMPLES = 1000
+
+# Шаг округления текущего времени (в секундах) при отборе опубликованных
+# постов: одинаковые запросы в пределах шага можно брать из кеша. Время
+# округляется вниз, поэтому в лентах посты появляются с опозданием до одного
+# шага; 0 — без округления.
+PUBLICATION_TIME_GRANULARITY = 0
+
+# Пагинация лент: 'offset' — по номерам страниц, 'cursor' — по курсору.
+FEED_PAGINATION = 'offset'
+
+# Подсчёт публикаций при пагинации по курсору: 'exact', 'approximate', 'off'.
+FEED_COUNT = 'exact'
+
+FEED_COUNT_LIMIT = 1000
+
+# Сколько секунд хранить в кеше количество публикаций в ленте.
+FEED_COUNT_CACHE_TIMEOUT = 60
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# До скольких строк считать отфильтрованные списки в админке.
+ADMIN_COUNT_LIMIT = 10000
+
+# Фоновые задачи: 'database' — очередь в базе, её выполняет
+# manage.py run_tasks; 'inline' — задачи выполняются сразу.
+TASK_BACKEND = 'database'
+
+# Через сколько секунд повторить упавшую задачу (растёт вдвое с каждой
+# попыткой) и когда считать зависшую задачу брошенной воркером.
+TASK_RETRY_DELAY = 30
+
+TASK_TIMEOUT = 10 * 60
+
+TASK_POLL_INTERVAL = 1
+
+# Кеш страниц лент для анонимных посетителей; 0 — отключить.
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 5 * 60
@@ -1,10 +1,10 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
 from core.forms import MyUserCreationForm
+from core.views import serve_media
 
 
 handler404 = 'pages.views.page_not_found'
@@ -14,6 +14,7 @@ urlpatterns = [
     path('', include('blog.urls', namespace='blog')),
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('stats/', include('core.urls', namespace='core')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
@@ -30,4 +31,10 @@ if settings.DEBUG:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += (
+    re_path(
+        rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$',
+        serve_media,
+        name='media',
+    ),
+)
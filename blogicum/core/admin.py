@@ -0,0 +1,115 @@
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.http import urlencode
+
+from .constants import ADMIN_INLINE_LIMIT
+from .models import Task
+from .paginators import EstimatedCountPaginator
+
+
+def changelist_link(model, count, **filters):
+    """Ссылка на список объектов модели, отфильтрованный по ``filters``."""
+    opts = model._meta
+    url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+    return format_html(
+        '<a href="{}?{}">{}: {}</a>',
+        url, urlencode(filters), opts.verbose_name_plural, count,
+    )
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр с полем ввода вместо списка всех возможных значений."""
+
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return (('', ''),)
+
+    def choices(self, changelist):
+        yield {
+            'parameter_name': self.parameter_name,
+            'value': self.value() or '',
+            'hidden_params': [
+                (name, value) for name, value in changelist.params.items()
+                if name not in (self.parameter_name, 'p')
+            ],
+            'clear_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class CappedInlineFormSet(BaseInlineFormSet):
+
+    def get_queryset(self):
+        if not hasattr(self, '_capped_queryset'):
+            self._capped_queryset = super().get_queryset()[:self.max_shown]
+        return self._capped_queryset
+
+
+class CappedInline(admin.TabularInline):
+    """Встроенный список, показывающий не больше ``max_shown`` объектов.
+
+    Остальные объекты открываются ссылкой на отфильтрованный список,
+    добавлять объекты через встроенный список нельзя.
+    """
+
+    formset = CappedInlineFormSet
+    max_shown = ADMIN_INLINE_LIMIT
+    extra = 0
+    show_change_link = True
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.max_shown = self.max_shown
+        return formset
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class LargeTableChangeList(ChangeList):
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(
+            *self.model_admin.list_deferred_fields
+        )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Список объектов для больших таблиц.
+
+    Количество строк оценивается, а не считается, тяжёлые поля из
+    ``list_deferred_fields`` не загружаются.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_deferred_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'created_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    readonly_fields = (
+        'attempts',
+        'locked_at',
+        'last_error',
+        'created_at',
+    )
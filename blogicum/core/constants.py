@@ -1,2 +1,10 @@
 MAX_LEN_CHARFIELD = 256
 PAGE_SIZE = 10
+COMMENTS_PAGE_SIZE = 50
+# Ширина уменьшенных копий изображений публикаций, в пикселях.
+IMAGE_VARIANT_WIDTHS = {'card': 640, 'detail': 1280}
+IMAGE_VARIANT_QUALITY = 80
+# Сколько символов текста показывать в списках админки.
+ADMIN_TEXT_PREVIEW_LENGTH = 100
+# Сколько связанных объектов показывать на странице объекта в админке.
+ADMIN_INLINE_LIMIT = 20
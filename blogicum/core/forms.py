@@ -1,5 +1,9 @@
+from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
 
 User = get_user_model()
 
@@ -16,3 +20,19 @@ class MyUserCreationForm(UserCreationForm):
             'password1',
             'password2'
         )
+
+
+class LimitedImageField(forms.ImageField):
+    """Поле картинки, учитывающее проверки ``LimitedUploadHandler``."""
+
+    def to_python(self, data):
+        error = getattr(data, 'upload_error', None)
+        if error:
+            raise ValidationError(error, code='upload_rejected')
+        if data and data.size > settings.MAX_UPLOAD_SIZE:
+            raise ValidationError(
+                'Файл слишком большой: разрешено не больше '
+                f'{filesizeformat(settings.MAX_UPLOAD_SIZE)}.',
+                code='file_too_large',
+            )
+        return super().to_python(data)
@@ -0,0 +1,48 @@
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import run_pending_tasks
+
+
+class Command(BaseCommand):
+    help = 'Запускает воркеры, выполняющие фоновые задачи из базы данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Сколько процессов-воркеров запустить.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        if options['processes'] == 1:
+            self.work(options['once'])
+            return
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=self.work, args=(options['once'],))
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def work(self, once):
+        while True:
+            processed = run_pending_tasks()
+            if processed:
+                self.stdout.write(f'Выполнено задач: {processed}')
+            if once:
+                return
+            time.sleep(settings.TASK_POLL_INTERVAL)
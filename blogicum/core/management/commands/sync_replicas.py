@@ -0,0 +1,59 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def copy_sqlite_database(source, target):
+    """Копирует базу SQLite целиком через backup API, не мешая читателям."""
+    with closing(sqlite3.connect(source)) as source_db:
+        with closing(sqlite3.connect(target)) as target_db:
+            source_db.backup(target_db)
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплики — замена настоящей '
+        'репликации для локальной проверки чтения с реплик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'replicas',
+            nargs='*',
+            help='Псевдонимы реплик; по умолчанию — все из READ_REPLICAS.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять копирование каждые N секунд; 0 — один раз.',
+        )
+
+    def handle(self, *args, **options):
+        replicas = options['replicas'] or settings.READ_REPLICAS
+        if not replicas:
+            raise CommandError('Реплики не указаны и READ_REPLICAS пуст.')
+        source = self.get_sqlite_name(DEFAULT_DB_ALIAS)
+        targets = [self.get_sqlite_name(alias) for alias in replicas]
+        while True:
+            for alias, target in zip(replicas, targets):
+                copy_sqlite_database(source, target)
+                self.stdout.write(f'Реплика {alias} обновлена.')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def get_sqlite_name(self, alias):
+        if alias not in connections:
+            raise CommandError(f'База {alias} не описана в DATABASES.')
+        settings_dict = connections[alias].settings_dict
+        if connections[alias].vendor != 'sqlite':
+            raise CommandError(
+                f'База {alias} — не SQLite; настройте репликацию '
+                'средствами СУБД.'
+            )
+        return str(settings_dict['NAME'])
@@ -0,0 +1,42 @@
+import base64
+import hashlib
+import re
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django_bootstrap5.core import get_bootstrap_setting
+
+SOURCE_MAP = re.compile(rb'/\*# sourceMappingURL=[^*]*\*/\s*$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Скачивает CSS Bootstrap из CDN django-bootstrap5 в статику проекта, '
+        'чтобы отдавать его самим с хешем в имени файла.'
+    )
+
+    def handle(self, *args, **options):
+        css_url = get_bootstrap_setting('css_url')
+        with urlopen(css_url['url'], timeout=30) as response:
+            content = response.read()
+        integrity = css_url.get('integrity')
+        if integrity:
+            algorithm, expected = integrity.split('-', 1)
+            digest = base64.b64encode(
+                hashlib.new(algorithm, content).digest()
+            ).decode()
+            if digest != expected:
+                raise CommandError(
+                    f'Хеш файла {css_url["url"]} не совпал с {integrity}.'
+                )
+        # Карты исходников нет в статике, а ссылка на неё сломает
+        # collectstatic с ManifestStaticFilesStorage.
+        content = SOURCE_MAP.sub(b'', content)
+        target = Path(settings.STATICFILES_DIRS[0]) / (
+            settings.BOOTSTRAP_LOCAL_CSS
+        )
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f'Сохранено: {target}'))
@@ -0,0 +1,190 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .routers import choose_replica, current_replica, pinned_to_primary
+from .timing import timing_stats
+
+logger = logging.getLogger(__name__)
+
+IN_PLACEHOLDERS = re.compile(r'\bIN \((?:%s, )*%s\)')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.shapes[IN_PLACEHOLDERS.sub('IN (%s, ...)', sql)] += 1
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self):
+        return sum(self.shapes.values())
+
+    def repeated(self, threshold):
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы запроса и ищет повторяющиеся (N+1).
+
+    Лимиты задаются в ``QUERY_BUDGETS`` по имени представления; при
+    ``QUERY_BUDGET_RAISE`` превышение лимита вызывает исключение, чтобы
+    его замечали тесты.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        self.check_queries(request, counter)
+        return response
+
+    def check_queries(self, request, counter):
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        for shape, count in counter.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                'Possible N+1 in %s: %d identical queries: %s',
+                view_name, count, shape,
+            )
+        budget = settings.QUERY_BUDGETS.get(
+            view_name, settings.QUERY_BUDGET_DEFAULT
+        )
+        if budget is None or counter.total <= budget:
+            return
+        message = (
+            f'{view_name} made {counter.total} queries, budget is {budget}'
+        )
+        logger.warning(message)
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+
+
+class DatabaseTimer:
+
+    def __init__(self):
+        self.duration = 0.0
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.queries += 1
+
+
+class ServerTimingMiddleware:
+    """Замеряет время запроса и отдаёт его в заголовке ``Server-Timing``.
+
+    Метрики: ``db`` — SQL-запросы, ``render`` — отрисовка
+    ``TemplateResponse``, ``total`` — весь запрос. Представления могут
+    добавить свои значения (в миллисекундах) в ``request.server_timing``.
+    Замеры копятся в ``timing_stats`` по имени представления.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.server_timing = {}
+        timer = DatabaseTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        timings = request.server_timing
+        timings['db'] = timer.duration * 1000
+        timings['total'] = (time.perf_counter() - started) * 1000
+        response['Server-Timing'] = ', '.join(
+            f'{metric};dur={duration:.2f}'
+            + (f';desc="{timer.queries} queries"' if metric == 'db' else '')
+            for metric, duration in timings.items()
+        )
+        match = request.resolver_match
+        if match and match.view_name:
+            timing_stats.add(match.view_name, timings)
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.server_timing['render'] = (
+                time.perf_counter() - started
+            ) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтение GET-запросов к ``REPLICA_READ_VIEWS`` на реплику.
+
+    После успешного изменяющего запроса посетитель на
+    ``REPLICA_PIN_SECONDS`` получает cookie, с которой читает с основной
+    базы и сразу видит свои изменения; общие счётчики в кеше при этом
+    пересчитываются по основной базе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            routing = getattr(request, '_replica_routing', None)
+            if routing is not None:
+                variable, token = routing
+                variable.reset(token)
+        if settings.READ_REPLICAS and (
+            request.method not in ('GET', 'HEAD', 'OPTIONS')
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.READ_REPLICAS:
+            return
+        if settings.REPLICA_PIN_COOKIE in request.COOKIES:
+            request._replica_routing = (
+                pinned_to_primary, pinned_to_primary.set(True)
+            )
+        elif (
+            request.method in ('GET', 'HEAD')
+            and request.resolver_match.view_name
+            in settings.REPLICA_READ_VIEWS
+        ):
+            request._replica_routing = (
+                current_replica, current_replica.set(choose_replica())
+            )
@@ -1,13 +1,30 @@
+import math
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from .paginators import CachedCountPaginator, CursorPaginator
+from .routers import get_cache_timeout, pinned_to_primary
+from .utils import get_visible_at
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
+
     def test_func(self):
         object = self.get_object()
-        return object.author == self.request.user
+        return object.author_id == self.request.user.pk
 
     def handle_no_permission(self):
         pk = self.kwargs['pk']
@@ -15,3 +32,90 @@ class OnlyAuthorMixin(UserPassesTestMixin):
             'blog:post_detail',
             kwargs={'pk': pk}
         ))
+
+
+class FeedPaginationMixin:
+    paginator_class = CachedCountPaginator
+    cursor_ordering = ('-pub_date', '-pk')
+    cursor_kwarg = 'cursor'
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset,
+            per_page,
+            count_cache_key=self.get_count_cache_key(),
+            count_cache_timeout=settings.FEED_COUNT_CACHE_TIMEOUT,
+            **kwargs,
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if settings.FEED_PAGINATION != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.cursor_ordering,
+            count_mode=settings.FEED_COUNT,
+            count_limit=settings.FEED_COUNT_LIMIT,
+            count_cache_key=self.get_count_cache_key(),
+            count_cache_timeout=settings.FEED_COUNT_CACHE_TIMEOUT,
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    page_cache_params = ('page', 'cursor')
+
+    def get_page_cache_key(self):
+        raise NotImplementedError
+
+    def get_page_cache_path(self):
+        """Путь страницы только с параметрами, влияющими на её содержимое."""
+        params = [
+            (name, self.request.GET[name])
+            for name in self.page_cache_params
+            if name in self.request.GET
+        ]
+        if not params:
+            return self.request.path
+        return f'{self.request.path}?{urlencode(params)}'
+
+    def get_next_publication(self):
+        return None
+
+    def get_page_cache_timeout(self):
+        timeout = settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+        next_publication = self.get_next_publication()
+        if next_publication is not None:
+            seconds = (
+                get_visible_at(next_publication) - timezone.now()
+            ).total_seconds()
+            timeout = min(timeout, max(1, math.ceil(seconds)))
+        return timeout
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method != 'GET'
+            or request.user.is_authenticated
+            or not settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+            or pinned_to_primary.get()
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = self.get_page_cache_key()
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            timeout = get_cache_timeout(self.get_page_cache_timeout())
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered, timeout)
+            )
+        return response
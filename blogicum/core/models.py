@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .constants import MAX_LEN_CHARFIELD
 
 
 User = get_user_model()
@@ -35,3 +38,53 @@ class WithRelations(PublishedStrModel):
 
     class Meta:
         abstract = True
+
+
+class Task(models.Model):
+    """Отложенная задача для ``manage.py run_tasks``."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(
+        max_length=MAX_LEN_CHARFIELD, verbose_name='Задача'
+    )
+    args = models.JSONField(default=list, verbose_name='Аргументы')
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name='Максимум попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now, verbose_name='Выполнить после'
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата и время создания'
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ['run_after', 'pk']
+        indexes = [
+            models.Index(
+                fields=['status', 'run_after'],
+                name='task_status_run_after_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
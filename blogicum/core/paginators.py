@@ -0,0 +1,245 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+from .routers import get_cache_timeout, pinned_to_primary
+
+COUNT_EXACT = 'exact'
+COUNT_APPROXIMATE = 'approximate'
+COUNT_OFF = 'off'
+
+
+def get_cached_count(key, queryset, timeout):
+    """Количество объектов ``queryset``, сохранённое в кеше под ``key``.
+
+    Посетитель, недавно изменивший данные, считает по основной базе и
+    обновляет запись кеша, которую могли заполнить с отстающей реплики.
+    """
+    if pinned_to_primary.get():
+        count = queryset.count()
+        cache.set(key, count, timeout)
+        return count
+    return cache.get_or_set(key, queryset.count, get_cache_timeout(timeout))
+
+
+class CachedCountPaginator(Paginator):
+
+    def __init__(
+        self, *args, count_cache_key=None, count_cache_timeout=None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.count_cache_timeout = count_cache_timeout
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        return get_cached_count(
+            self.count_cache_key, self.object_list, self.count_cache_timeout
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор для больших таблиц, не считающий строки точно.
+
+    Без фильтров размер таблицы оценивается по статистике PostgreSQL или
+    по наибольшему первичному ключу, с фильтрами строки считаются лишь
+    до ``ADMIN_COUNT_LIMIT``.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_table_size(queryset)
+            if estimate is not None:
+                return estimate
+        limit = settings.ADMIN_COUNT_LIMIT
+        return queryset.order_by()[:limit].count()
+
+
+def estimate_table_size(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return int(row[0])
+        return None
+    return queryset.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+
+
+class CursorPage(Sequence):
+    cursor_based = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Page by cursor of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def count(self):
+        return self.paginator.count
+
+    @property
+    def count_is_exact(self):
+        return self.paginator.count_is_exact
+
+
+class CursorPaginator:
+    """Keyset-пагинатор: страница ищется по значениям полей сортировки.
+
+    Стоимость запроса не зависит от номера страницы, а общее количество
+    объектов считается точно, приблизительно (не больше ``count_limit``)
+    или не считается вовсе — в зависимости от ``count_mode``.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        ordering=('-pub_date', '-pk'),
+        count_mode=COUNT_EXACT,
+        count_limit=1000,
+        count_cache_key=None,
+        count_cache_timeout=None,
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.count_mode = count_mode
+        self.count_limit = count_limit
+        self.count_cache_key = count_cache_key
+        self.count_cache_timeout = count_cache_timeout
+
+    @cached_property
+    def _counted(self):
+        if self.count_mode == COUNT_OFF:
+            return None, False
+        queryset = self.object_list.order_by()
+        if self.count_mode == COUNT_APPROXIMATE:
+            count = queryset[:self.count_limit + 1].count()
+            if count > self.count_limit:
+                return self.count_limit, False
+            return count, True
+        if self.count_cache_key is None:
+            return queryset.count(), True
+        count = get_cached_count(
+            self.count_cache_key, queryset, self.count_cache_timeout
+        )
+        return count, True
+
+    @property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def count_is_exact(self):
+        return self._counted[1]
+
+    def page(self, cursor=None):
+        position, backwards = self.decode_cursor(cursor)
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(self._reverse(field) for field in ordering)
+        queryset = self.object_list.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, ordering))
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if backwards:
+            items.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        next_cursor = previous_cursor = None
+        if items and has_next:
+            next_cursor = self.encode_cursor(items[-1])
+        if items and has_previous:
+            previous_cursor = self.encode_cursor(items[0], backwards=True)
+        return CursorPage(items, self, next_cursor, previous_cursor)
+
+    def encode_cursor(self, item, backwards=False):
+        position = [
+            self._get_field(field).value_to_string(item)
+            for field in self._field_names
+        ]
+        payload = json.dumps([position, backwards]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, False
+        try:
+            payload = base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            )
+            position, backwards = json.loads(payload)
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self._get_field(field).to_python(value)
+                for field, value in zip(self._field_names, position)
+            ]
+        except (
+            binascii.Error, TypeError, ValueError, ValidationError
+        ) as error:
+            raise InvalidPage('Некорректный курсор страницы.') from error
+        return position, bool(backwards)
+
+    @cached_property
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _get_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def _after(self, position, ordering):
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            for previous, value in zip(ordering[:index], position):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
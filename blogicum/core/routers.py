@@ -0,0 +1,63 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+current_replica = ContextVar('current_replica', default=None)
+pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+
+
+def choose_replica():
+    if settings.READ_REPLICAS:
+        return random.choice(settings.READ_REPLICAS)
+    return None
+
+
+@contextmanager
+def read_from_replicas():
+    """Направляет чтение внутри блока на одну из реплик ``READ_REPLICAS``.
+
+    Реплика выбирается один раз на весь блок, чтобы все запросы видели
+    одно и то же состояние данных.
+    """
+    token = current_replica.set(choose_replica())
+    try:
+        yield
+    finally:
+        current_replica.reset(token)
+
+
+def get_cache_timeout(timeout):
+    """Время жизни записи кеша, заполняемой данными текущего запроса.
+
+    Реплика может отставать: прочитанные с неё данные после сброса кеша
+    не должны задерживаться в нём дольше ``REPLICA_CACHE_TIMEOUT``.
+    """
+    if current_replica.get() is None:
+        return timeout
+    if timeout is None:
+        return settings.REPLICA_CACHE_TIMEOUT
+    return min(timeout, settings.REPLICA_CACHE_TIMEOUT)
+
+
+class ReplicaRouter:
+    """Читает с реплики внутри ``read_from_replicas()``, пишет в основную."""
+
+    def db_for_read(self, model, **hints):
+        return current_replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.READ_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.READ_REPLICAS:
+            return False
+        return None
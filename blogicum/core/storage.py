@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASHED_NAME = re.compile(r'(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.\w+$')
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.json', '.txt', '.xml', '.html',
+)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит каждый файл один раз под SHA-256 его содержимого.
+
+    Имя файла — ``<каталог>/ab/cd/<хеш>.<расширение>``; одинаковые загрузки
+    получают одно и то же имя, поэтому файл может принадлежать нескольким
+    объектам, и удалять его можно только когда ссылок на него не осталось.
+    Хеш считается при потоковой записи во временный файл, который затем
+    атомарно переименовывается.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory, basename = posixpath.split(name)
+        extension = posixpath.splitext(basename)[1].lower()
+        os.makedirs(self.location, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=self.location, prefix='.upload-'
+        )
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+            name = self.get_hashed_name(
+                directory, digest.hexdigest(), extension
+            )
+            full_path = self.path(name)
+            if not os.path.exists(full_path):
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, full_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return name
+
+    @staticmethod
+    def get_hashed_name(directory, digest, extension):
+        return posixpath.join(
+            directory, digest[:2], digest[2:4], f'{digest}{extension}'
+        )
+
+    @staticmethod
+    def is_content_addressed(name):
+        return bool(HASHED_NAME.search(name))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем в именах и заранее сжатыми копиями.
+
+    ``collectstatic`` рядом с каждым текстовым файлом кладёт ``.gz`` и,
+    если установлен пакет ``brotli``, ``.br`` — их может отдавать
+    веб-сервер (``gzip_static``/``brotli_static`` в nginx). Пока манифест
+    не собран (разработка, тесты) или файла в нём нет, ``{% static %}``
+    возвращает исходное имя файла.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = set()
+        for name, hashed_name, result in super().post_process(
+            paths, dry_run, **options
+        ):
+            if isinstance(hashed_name, str):
+                processed.add(hashed_name)
+            yield name, hashed_name, result
+        if dry_run:
+            return
+        for name in sorted(processed):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        variants = {'.gz': gzip.compress(content, 9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content)
+        for extension, compressed in variants.items():
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(compressed))
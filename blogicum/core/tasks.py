@@ -0,0 +1,127 @@
+import functools
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DATABASE = 'database'
+BACKEND_INLINE = 'inline'
+
+
+class TaskFunction:
+    """Функция, которую можно выполнить в фоне через ``delay()``.
+
+    С ``TASK_BACKEND = 'inline'`` задача выполняется сразу, а ошибки не
+    перехватываются — так её удобно проверять в тестах.
+    """
+
+    def __init__(self, func, max_attempts, on_failure, unique):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.max_attempts = max_attempts
+        self.on_failure = on_failure
+        self.unique = unique
+        self.name = f'{func.__module__}.{func.__qualname__}'
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def delay(self, *args):
+        if settings.TASK_BACKEND == BACKEND_INLINE:
+            self.func(*args)
+            return None
+        if self.unique:
+            queued = Task.objects.filter(
+                name=self.name, args=list(args), status=Task.Status.PENDING
+            ).first()
+            if queued is not None:
+                return queued
+        return Task.objects.create(
+            name=self.name,
+            args=list(args),
+            max_attempts=self.max_attempts,
+        )
+
+
+def task(max_attempts=3, on_failure=None, unique=False):
+    """Регистрирует фоновую задачу.
+
+    ``on_failure`` вызывается с теми же аргументами, когда попытки
+    выполнить задачу закончились. Задача с ``unique`` не ставится в
+    очередь повторно, пока там ждёт такая же.
+    """
+    def decorator(func):
+        return TaskFunction(func, max_attempts, on_failure, unique)
+    return decorator
+
+
+def get_available_tasks(now):
+    stale = now - timedelta(seconds=settings.TASK_TIMEOUT)
+    return Task.objects.filter(
+        Q(status=Task.Status.PENDING, run_after__lte=now)
+        | Q(status=Task.Status.RUNNING, locked_at__lt=stale)
+    )
+
+
+def claim_task():
+    """Забирает задачу из очереди; ``None``, если выполнять нечего.
+
+    Задача помечается выполняемой условным UPDATE, поэтому одну задачу
+    не возьмут два воркера. Зависшие задачи возвращаются в работу через
+    ``TASK_TIMEOUT`` секунд.
+    """
+    now = timezone.now()
+    candidates = get_available_tasks(now).values_list('pk', flat=True)
+    for pk in candidates[:10]:
+        claimed = get_available_tasks(now).filter(pk=pk).update(
+            status=Task.Status.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def run_task(task):
+    """Выполняет задачу: удачную удаляет, неудачную откладывает."""
+    func = None
+    try:
+        func = import_string(task.name)
+        func(*task.args)
+    except Exception:
+        logger.exception('Task %s (%s) failed', task.name, task.pk)
+        task.last_error = traceback.format_exc()
+    else:
+        task.delete()
+        return True
+    task.locked_at = None
+    if task.attempts < task.max_attempts:
+        task.status = Task.Status.PENDING
+        task.run_after = timezone.now() + timedelta(
+            seconds=settings.TASK_RETRY_DELAY * 2 ** (task.attempts - 1)
+        )
+    else:
+        task.status = Task.Status.FAILED
+        on_failure = getattr(func, 'on_failure', None)
+        if on_failure is not None:
+            on_failure(*task.args)
+    task.save(update_fields=['status', 'run_after', 'locked_at', 'last_error'])
+    return False
+
+
+def run_pending_tasks():
+    """Выполняет все задачи, готовые к запуску; возвращает их количество."""
+    processed = 0
+    while (task := claim_task()) is not None:
+        run_task(task)
+        processed += 1
+    return processed
@@ -0,0 +1,25 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def static_file_exists(path):
+    return bool(finders.find(path)) or staticfiles_storage.exists(path)
+
+
+@register.simple_tag
+def local_bootstrap_css():
+    """CSS Bootstrap из своей статики, а если копии нет — с CDN."""
+    path = settings.BOOTSTRAP_LOCAL_CSS
+    if not static_file_exists(path):
+        return bootstrap_css()
+    return format_html('<link rel="stylesheet" href="{}">', static(path))
@@ -0,0 +1,68 @@
+import math
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+PERCENTILES = (50, 95, 99)
+
+
+class TimingStats:
+    """Последние замеры длительности запросов по имени представления.
+
+    Для каждой пары (представление, метрика) хранится не больше
+    ``SERVER_TIMING_SAMPLES`` последних значений в миллисекундах. Данные
+    живут в памяти процесса, поэтому у каждого воркера они свои.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(dict)
+
+    def add(self, view_name, timings):
+        with self._lock:
+            metrics = self._samples[view_name]
+            for metric, duration in timings.items():
+                if metric not in metrics:
+                    metrics[metric] = deque(
+                        maxlen=settings.SERVER_TIMING_SAMPLES
+                    )
+                metrics[metric].append(duration)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        with self._lock:
+            samples = {
+                view_name: {
+                    metric: sorted(values)
+                    for metric, values in metrics.items()
+                }
+                for view_name, metrics in self._samples.items()
+            }
+        return {
+            view_name: {
+                metric: {
+                    'count': len(values),
+                    **{
+                        f'p{percentile}': round(
+                            get_percentile(values, percentile), 2
+                        )
+                        for percentile in PERCENTILES
+                    },
+                }
+                for metric, values in metrics.items()
+            }
+            for view_name, metrics in sorted(samples.items())
+        }
+
+
+def get_percentile(values, percentile):
+    """Перцентиль по методу ближайшего ранга для отсортированных значений."""
+    rank = math.ceil(percentile / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+timing_stats = TimingStats()
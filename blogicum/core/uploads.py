@@ -0,0 +1,105 @@
+import io
+import time
+import warnings
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
+
+# Сколько байт начала файла читать, чтобы разобрать заголовок картинки:
+# у фотографий перед размерами может идти большой блок EXIF.
+IMAGE_HEADER_LIMIT = 512 * 1024
+
+
+class RejectedUpload(UploadedFile):
+    """Отклонённый при чтении файл; ``LimitedImageField`` покажет ошибку."""
+
+    def __init__(self, name, error):
+        super().__init__(file=io.BytesIO(), name=name, size=0)
+        self.upload_error = error
+
+
+def identify_image(header):
+    """Формат и размеры картинки по заголовку, без декодирования пикселей.
+
+    Возвращает ``None``, если данных пока недостаточно. Для картинок больше
+    собственного предела Pillow пробрасывает ``Image.DecompressionBombError``.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+        try:
+            with Image.open(io.BytesIO(header)) as image:
+                return image.format, image.size
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+            return None
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """Проверяет загружаемые картинки по мере чтения запроса.
+
+    Ставится первым в ``FILE_UPLOAD_HANDLERS``. Файл больше
+    ``MAX_UPLOAD_SIZE``, не картинка из ``IMAGE_UPLOAD_FORMATS`` или
+    картинка больше ``MAX_IMAGE_PIXELS`` пикселей отклоняется сразу: его
+    дальнейшие данные не передаются следующим обработчикам, то есть не
+    копятся ни в памяти, ни на диске. Время чтения файлов попадает в
+    ``Server-Timing`` как ``upload``.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.started = time.perf_counter()
+        self.header = bytearray()
+        self.image_info = None
+        self.error = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None
+        if start + len(raw_data) > settings.MAX_UPLOAD_SIZE:
+            self.error = (
+                'Файл слишком большой: разрешено не больше '
+                f'{filesizeformat(settings.MAX_UPLOAD_SIZE)}.'
+            )
+            return None
+        if self.image_info is None:
+            self.header += raw_data[:IMAGE_HEADER_LIMIT - len(self.header)]
+            try:
+                self.image_info = identify_image(bytes(self.header))
+            except Image.DecompressionBombError:
+                self.error = 'Изображение слишком большое.'
+                return None
+            if self.image_info is None:
+                if len(self.header) >= IMAGE_HEADER_LIMIT:
+                    self.error = 'Загрузите изображение.'
+            else:
+                self.error = self.check_image(*self.image_info)
+            if self.error:
+                return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.report_time()
+        if self.error is None and self.image_info is None:
+            self.error = 'Загрузите изображение.'
+        if self.error:
+            return RejectedUpload(self.file_name, self.error)
+        return None
+
+    def check_image(self, image_format, size):
+        if image_format not in settings.IMAGE_UPLOAD_FORMATS:
+            return f'Формат {image_format} не поддерживается.'
+        width, height = size
+        if width * height > settings.MAX_IMAGE_PIXELS:
+            return (
+                f'Изображение слишком большое: {width}×{height} пикселей.'
+            )
+        return None
+
+    def report_time(self):
+        server_timing = getattr(self.request, 'server_timing', None)
+        if server_timing is not None:
+            server_timing['upload'] = server_timing.get('upload', 0) + (
+                time.perf_counter() - self.started
+            ) * 1000
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+urlpatterns = [
+    path('timings/', views.timings, name='timings'),
+]
@@ -0,0 +1,38 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def get_granularity(granularity=None):
+    if granularity is None:
+        return settings.PUBLICATION_TIME_GRANULARITY
+    return granularity
+
+
+def get_rounded_now(granularity=None):
+    """Текущее время, округлённое вниз до ``granularity`` секунд.
+
+    В пределах одного интервала запросы с фильтром по времени получаются
+    одинаковыми, поэтому их результаты можно переиспользовать из кеша.
+    Отложенные публикации появляются с опозданием до одного интервала,
+    но никогда не раньше срока.
+    """
+    granularity = get_granularity(granularity)
+    now = timezone.now()
+    if not granularity:
+        return now
+    timestamp = math.floor(now.timestamp() / granularity) * granularity
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def get_visible_at(pub_date, granularity=None):
+    """Когда публикацию с ``pub_date`` начнёт показывать ``published()``."""
+    granularity = get_granularity(granularity)
+    if not granularity:
+        return pub_date
+    timestamp = (
+        math.floor(pub_date.timestamp() / granularity) + 1
+    ) * granularity
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
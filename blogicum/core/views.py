@@ -0,0 +1,138 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse, JsonResponse,
+                         StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import ContentAddressedStorage
+from .timing import timing_stats
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+@staff_member_required
+def timings(request):
+    return JsonResponse(timing_stats.summary())
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдаёт файл из ``MEDIA_ROOT``.
+
+    Поддерживает условные запросы (``ETag``, ``Last-Modified``) и один
+    диапазон ``Range``. С ``MEDIA_SENDFILE`` сам файл отдаёт веб-сервер:
+    ответ содержит только заголовок ``X-Sendfile`` или
+    ``X-Accel-Redirect``.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    etag = get_media_etag(path, stat)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        response = get_media_response(request, path, full_path, stat, etag)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = get_media_cache_control(path)
+    return response
+
+
+def get_media_etag(path, stat):
+    if ContentAddressedStorage.is_content_addressed(path):
+        return f'"{os.path.splitext(os.path.basename(path))[0]}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def get_media_cache_control(path):
+    if ContentAddressedStorage.is_content_addressed(path):
+        return (
+            f'public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+        )
+    return f'public, max-age={settings.MEDIA_MAX_AGE}'
+
+
+def get_media_response(request, path, full_path, stat, etag):
+    content_type = mimetypes.guess_type(full_path)[0]
+    content_type = content_type or 'application/octet-stream'
+    if settings.MEDIA_SENDFILE == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+        return response
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+        )
+        return response
+    byte_range = get_byte_range(request, stat.st_size, etag)
+    if byte_range is None:
+        response = FileResponse(
+            open(full_path, 'rb'), content_type=content_type
+        )
+    elif byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(full_path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def get_byte_range(request, size, etag):
+    """Границы запрошенного диапазона включительно.
+
+    ``None`` — отдать файл целиком (нет ``Range``, несколько диапазонов
+    или не совпал ``If-Range``), ``False`` — диапазон вне файла.
+    """
+    header = request.headers.get('Range', '')
+    match = RANGE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    if request.headers.get('If-Range', etag) != etag:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end or size - 1), size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_range(full_path, start, length):
+    with open(full_path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
@@ -0,0 +1,230 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from core.constants import ADMIN_INLINE_LIMIT, ADMIN_TEXT_PREVIEW_LENGTH
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, another_user):
+    mixer.cycle(5).blend('blog.Post', author=user, text='Слово ' * 100)
+    mixer.cycle(5).blend('blog.Post', author=another_user)
+
+
+def get_changelist(admin_client, url, data=None):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url, data)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_post_changelist_queries_do_not_grow(admin_client, mixer, posts):
+    _, expected = get_changelist(admin_client, '/admin/blog/post/')
+    mixer.cycle(10).blend('blog.Post')
+    response, actual = get_changelist(admin_client, '/admin/blog/post/')
+    assert actual == expected, (
+        'Убедитесь, что список публикаций в админке загружает автора, '
+        'местоположение и категорию одним запросом.'
+    )
+    assert len(response.context['cl'].result_list) == 20
+
+
+def test_post_changelist_truncates_text(admin_client, posts):
+    response, _ = get_changelist(admin_client, '/admin/blog/post/')
+    post = response.context['cl'].result_list[0]
+    assert 'text' in post.get_deferred_fields(), (
+        'Убедитесь, что список публикаций в админке не загружает '
+        'полный текст публикаций.'
+    )
+    assert len(post.text_preview) <= ADMIN_TEXT_PREVIEW_LENGTH
+
+
+def test_post_changelist_filters_by_username(admin_client, user, posts):
+    response, _ = get_changelist(
+        admin_client, '/admin/blog/post/', {'author': user.username}
+    )
+    result = response.context['cl'].result_list
+    assert len(result) == 5
+    assert all(post.author == user for post in result)
+    assert f'value="{user.username}"' in response.content.decode(), (
+        'Убедитесь, что фильтр по автору — поле ввода логина, '
+        'а не список всех пользователей.'
+    )
+
+
+def test_post_form_uses_autocomplete(admin_client, posts):
+    response = admin_client.get('/admin/blog/post/add/')
+    form = response.context['adminform'].form
+    for field in ('author', 'location', 'category'):
+        widget = form.fields[field].widget.widget
+        assert isinstance(widget, AutocompleteSelect), (
+            f'Убедитесь, что поле `{field}` выбирается через автодополнение.'
+        )
+
+
+def test_comment_changelist(admin_client, mixer, posts, user):
+    post = mixer.blend('blog.Post')
+    mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    _, expected = get_changelist(admin_client, '/admin/blog/comment/')
+    mixer.cycle(5).blend('blog.Comment')
+    response, actual = get_changelist(admin_client, '/admin/blog/comment/')
+    assert actual == expected
+    response, _ = get_changelist(
+        admin_client, '/admin/blog/comment/', {'q': user.username}
+    )
+    assert len(response.context['cl'].result_list) == 3
+
+
+def test_category_page_caps_post_inline(admin_client, mixer):
+    category = mixer.blend('blog.Category')
+    mixer.cycle(ADMIN_INLINE_LIMIT + 5).blend('blog.Post', category=category)
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(
+            f'/admin/blog/category/{category.pk}/change/'
+        )
+    assert response.status_code == 200
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == ADMIN_INLINE_LIMIT, (
+        'Убедитесь, что на странице категории показывается не больше '
+        f'{ADMIN_INLINE_LIMIT} публикаций.'
+    )
+    assert len(queries) <= 20
+    link = f'/admin/blog/post/?category__id__exact={category.pk}'
+    content = response.content.decode()
+    assert link.replace('&', '&amp;') in content
+    assert f'Публикации: {ADMIN_INLINE_LIMIT + 5}' in content, (
+        'Убедитесь, что страница категории ссылается на список всех её '
+        'публикаций и показывает их количество.'
+    )
+    assert admin_client.get(link).status_code == 200
+
+
+def test_post_page_links_to_comments(admin_client, mixer):
+    post = mixer.blend('blog.Post')
+    mixer.cycle(ADMIN_INLINE_LIMIT + 1).blend('blog.Comment', post=post)
+    response = admin_client.get(f'/admin/blog/post/{post.pk}/change/')
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == ADMIN_INLINE_LIMIT
+    link = f'/admin/blog/comment/?post__id__exact={post.pk}'
+    assert link in response.content.decode()
+    response = admin_client.get(link)
+    assert len(response.context['cl'].result_list) == ADMIN_INLINE_LIMIT + 1
+
+
+def run_action(admin_client, url, action, objects, **data):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(url, {
+            'action': action,
+            '_selected_action': [obj.pk for obj in objects],
+            **data,
+        }, follow=True)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+@pytest.fixture
+def published_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        is_published=True,
+        location=None,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_unpublish_action_is_set_based(admin_client, client, mixer,
+                                       published_posts):
+    client.get('/')
+    _, few = run_action(
+        admin_client, '/admin/blog/post/', 'unpublish', published_posts[:1]
+    )
+    more_posts = published_posts[1:] + mixer.cycle(5).blend('blog.Post')
+    response, many = run_action(
+        admin_client, '/admin/blog/post/', 'unpublish', more_posts
+    )
+    assert many == few, (
+        'Убедитесь, что массовое снятие с публикации выполняется одним '
+        'запросом, а не по одному на каждую публикацию.'
+    )
+    assert 'Снято с публикации: 7.' in response.content.decode()
+    assert not Post.objects.filter(is_published=True).exists()
+    assert list(client.get('/').context['page_obj']) == [], (
+        'Убедитесь, что после массового снятия с публикации кеш лент '
+        'сбрасывается.'
+    )
+
+
+def test_move_to_category_action(admin_client, client, mixer,
+                                 published_posts, published_category):
+    category = mixer.blend('blog.Category', is_published=True)
+    client.get(f'/category/{category.slug}/')
+    run_action(
+        admin_client, '/admin/blog/post/', 'move_to_category',
+        published_posts[:2], category=category.pk,
+    )
+    assert Post.objects.filter(category=category).count() == 2
+    response = client.get(f'/category/{category.slug}/')
+    assert len(response.context['page_obj']) == 2
+
+
+def test_delete_posts_by_author_action(admin_client, mixer, user,
+                                       another_user, published_posts):
+    for post in published_posts:
+        mixer.blend('blog.Comment', post=post, author=another_user)
+    other_post = mixer.blend('blog.Post', author=another_user)
+    response, _ = run_action(
+        admin_client, '/admin/blog/post/', 'delete_by_author',
+        published_posts[:1],
+    )
+    assert 'Удалено: 3.' in response.content.decode()
+    assert list(Post.objects.all()) == [other_post]
+    assert not Comment.objects.exists()
+
+
+def test_delete_comments_by_author_action(admin_client, mixer, user,
+                                          published_posts):
+    post = published_posts[0]
+    spam = mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    kept = mixer.blend('blog.Comment', post=post)
+    run_action(
+        admin_client, '/admin/blog/comment/', 'delete_by_author', spam[:1]
+    )
+    assert list(Comment.objects.all()) == [kept]
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что после массового удаления комментариев счётчик '
+        'комментариев публикации пересчитывается.'
+    )
+
+
+def test_unpublish_category_action(admin_client, client, published_posts,
+                                   published_category):
+    client.get('/')
+    run_action(
+        admin_client, '/admin/blog/category/', 'unpublish',
+        [published_category],
+    )
+    published_category.refresh_from_db()
+    assert not published_category.is_published
+    assert list(client.get('/').context['page_obj']) == []
+
+
+def test_comment_post_is_read_only_on_change(admin_client, mixer):
+    comment = mixer.blend('blog.Comment')
+    response = admin_client.get(f'/admin/blog/comment/{comment.pk}/change/')
+    assert 'post' not in response.context['adminform'].form.fields, (
+        'Убедитесь, что комментарий нельзя перенести в другую публикацию'
+        ' через админку.'
+    )
+    response = admin_client.get('/admin/blog/comment/add/')
+    assert 'post' in response.context['adminform'].form.fields
@@ -0,0 +1,61 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post)
+    post.refresh_from_db()
+    assert post.comment_count == len(comments), (
+        "Убедитесь, что при создании комментария увеличивается счётчик"
+        " `comment_count` у публикации."
+    )
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == len(comments) - 1, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " `comment_count` у публикации."
+    )
+
+
+def test_recount_comments_command(
+        mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post)
+    Post.objects.update(comment_count=0)
+
+    call_command('recount_comments', batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `recount_comments` пересчитывает количество"
+        " комментариев у публикаций."
+    )
+
+
+def test_post_delete_does_not_touch_each_comment(
+        mixer: Mixer, django_assert_max_num_queries
+):
+    few = mixer.blend(Post)
+    mixer.cycle(2).blend(Comment, post=few)
+    many = mixer.blend(Post)
+    mixer.cycle(30).blend(Comment, post=many)
+    with CaptureQueriesContext(connection) as queries:
+        few.delete()
+    with django_assert_max_num_queries(len(queries)):
+        many.delete()
+    assert not Comment.objects.exists(), (
+        "Убедитесь, что при удалении публикации её комментарии удаляются"
+        " без отдельных запросов для каждого комментария."
+    )
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from mixer.backend.django import Mixer
+
+import blog.views
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def small_comment_pages(monkeypatch):
+    monkeypatch.setattr(blog.views, 'COMMENTS_PAGE_SIZE', 2)
+
+
+def test_comments_are_paginated(
+        mixer: Mixer, client, small_comment_pages,
+        post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend('blog.Comment', post=post)
+    response = client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    assert len(page) == 2 and page.has_next(), (
+        "Убедитесь, что на странице публикации комментарии выводятся"
+        " постранично."
+    )
+
+    seen = [comment.id for comment in page]
+    cursor = page.next_cursor
+    while cursor:
+        response = client.get(
+            f'/posts/{post.id}/comments/?cursor={cursor}&format=json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        seen += [
+            comment.id for comment in comments
+            if f'name="comment_{comment.id}"' in data['html']
+        ]
+        cursor = data['next_cursor']
+    assert seen == [comment.id for comment in comments], (
+        "Убедитесь, что подгрузка комментариев возвращает все комментарии"
+        " по порядку."
+    )
+
+
+def test_comments_fragment_respects_visibility(
+        client, unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    response = client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарии к неопубликованной публикации недоступны"
+        " другим пользователям."
+    )
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(FEED_PAGINATION='cursor')
+def test_cursor_pages_cover_feed(
+        user_client, many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    response = user_client.get('/')
+    first_page = response.context['page_obj']
+    assert len(first_page) == N_PER_PAGE, (
+        "Убедитесь, что пагинация по курсору отдаёт полную первую страницу."
+    )
+    assert first_page.count == len(posts)
+    assert not first_page.has_previous()
+
+    response = user_client.get(f'/?cursor={first_page.next_cursor}')
+    second_page = response.context['page_obj']
+    seen = [post.id for post in first_page] + [post.id for post in second_page]
+    assert sorted(seen) == sorted(post.id for post in posts), (
+        "Убедитесь, что страницы по курсору не теряют и не повторяют"
+        " публикации."
+    )
+    assert not second_page.has_next()
+
+    response = user_client.get(f'/?cursor={second_page.previous_cursor}')
+    assert [post.id for post in response.context['page_obj']] == [
+        post.id for post in first_page
+    ], "Убедитесь, что ссылка назад по курсору ведёт на предыдущую страницу."
+
+
+@override_settings(FEED_PAGINATION='cursor', FEED_COUNT='off')
+def test_cursor_without_count(user_client, many_posts_with_published_locations):
+    response = user_client.get('/')
+    assert response.context['page_obj'].count is None
+
+
+@override_settings(FEED_PAGINATION='cursor')
+def test_invalid_cursor(user_client):
+    response = user_client.get('/?cursor=broken')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что некорректный курсор приводит к ошибке 404."
+    )
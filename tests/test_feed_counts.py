@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_feed_count(client, url):
+    return client.get(url).context['page_obj'].paginator.count
+
+
+def test_feed_count_is_cached(user_client, post_with_published_location):
+    assert get_feed_count(user_client, '/') == 1
+    with CaptureQueriesContext(connection) as context:
+        user_client.get('/')
+    count_queries = [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    assert not count_queries, (
+        "Убедитесь, что количество публикаций в ленте берётся из кеша."
+    )
+
+
+def test_feed_count_invalidation(
+        mixer: Mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    category_url = f'/category/{post.category.slug}/'
+    profile_url = f'/profile/{post.author.username}/'
+    for url in ('/', category_url, profile_url):
+        assert get_feed_count(user_client, url) == 1
+
+    mixer.blend(
+        'blog.Post',
+        author=post.author,
+        category=post.category,
+        location=post.location,
+    )
+    for url in ('/', category_url, profile_url):
+        assert get_feed_count(user_client, url) == 2, (
+            "Убедитесь, что кешированное количество публикаций сбрасывается"
+            " при создании публикации."
+        )
+
+    post.category.is_published = False
+    post.category.save()
+    assert get_feed_count(user_client, '/') == 0, (
+        "Убедитесь, что кешированное количество публикаций сбрасывается"
+        " при снятии категории с публикации."
+    )
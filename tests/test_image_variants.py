@@ -0,0 +1,64 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(width=1600, height=1200):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG'
+    )
+    return ImageFile(buffer, name='variant_image.jpg')
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=make_image(),
+    )
+    post.refresh_from_db()
+    return post
+
+
+def test_image_variants_are_created(post_with_large_image):
+    variants = post_with_large_image.image_variants
+    storage = post_with_large_image.image.storage
+    assert variants['source'] == post_with_large_image.image.name
+    assert variants['card']['width'] == 640
+    assert variants['detail']['width'] == 1280
+    for size in ('card', 'detail'):
+        for image_format in ('jpeg', 'webp'):
+            assert storage.exists(variants[size][image_format])
+
+
+def test_card_uses_variants(user_client, post_with_large_image):
+    content = user_client.get('/').content.decode('utf-8')
+    card = post_with_large_image.image_variants['card']
+    storage = post_with_large_image.image.storage
+    assert storage.url(card['jpeg']) in content, (
+        'Убедитесь, что в ленте показывается уменьшенная копия фото.'
+    )
+    assert 'srcset=' in content and 'image/webp' in content
+    assert 'loading="lazy"' in content
+
+
+def test_missing_variants_are_generated_by_command(post_with_large_image):
+    Post.objects.filter(pk=post_with_large_image.pk).update(image_variants={})
+
+    call_command('generate_image_variants', stdout=None)
+    post_with_large_image.refresh_from_db()
+    assert (
+        post_with_large_image.image_variants['source']
+        == post_with_large_image.image.name
+    ), 'Убедитесь, что команда достраивает недостающие копии фото.'
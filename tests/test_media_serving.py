@@ -0,0 +1,97 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage, storages
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file():
+    name = default_storage.save('post_images/served.jpg', ContentFile(CONTENT))
+    yield default_storage.url(name)
+    default_storage.delete(name)
+
+
+@pytest.fixture
+def hashed_media_file():
+    storage = storages['post_images']
+    name = storage.save('post_images/served.jpg', ContentFile(CONTENT))
+    yield storage.url(name)
+    storage.delete(name)
+
+
+def test_full_response(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == CONTENT
+    assert response['Accept-Ranges'] == 'bytes'
+    assert response['ETag'] and response['Last-Modified']
+
+
+def test_conditional_requests(client, media_file):
+    response = client.get(media_file)
+    not_modified = client.get(
+        media_file, HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert not_modified.status_code == 304, (
+        'Убедитесь, что на запрос с совпадающим `If-None-Match` медиафайл'
+        ' не отдаётся повторно.'
+    )
+    not_modified = client.get(
+        media_file, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-9', CONTENT[:10]),
+    ('bytes=1000-', CONTENT[1000:]),
+    ('bytes=-5', CONTENT[-5:]),
+    ('bytes=1020-5000', CONTENT[1020:]),
+])
+def test_range_requests(client, media_file, header, expected):
+    response = client.get(media_file, HTTP_RANGE=header)
+    assert response.status_code == 206, (
+        'Убедитесь, что медиафайлы поддерживают запросы с `Range`.'
+    )
+    assert b''.join(response.streaming_content) == expected
+    assert int(response['Content-Length']) == len(expected)
+
+
+def test_unsatisfiable_range(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=5000-')
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_if_range_mismatch_returns_full_file(client, media_file):
+    response = client.get(
+        media_file, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"outdated"'
+    )
+    assert response.status_code == 200
+
+
+def test_cache_headers(client, media_file, hashed_media_file):
+    assert 'immutable' not in client.get(media_file)['Cache-Control']
+    response = client.get(hashed_media_file)
+    assert 'immutable' in response['Cache-Control']
+    assert response['ETag'].strip('"') in hashed_media_file
+
+
+@pytest.mark.parametrize('mode, header', [
+    ('x-sendfile', 'X-Sendfile'),
+    ('x-accel-redirect', 'X-Accel-Redirect'),
+])
+def test_sendfile(settings, client, media_file, mode, header):
+    settings.MEDIA_SENDFILE = mode
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert response[header].endswith('post_images/served.jpg'), (
+        'Убедитесь, что в режиме sendfile файл отдаёт веб-сервер.'
+    )
+    assert response.content == b''
+
+
+def test_path_outside_media_root(client):
+    assert client.get('/media/../manage.py').status_code == 404
+    assert client.get('/media/post_images/missing.jpg').status_code == 404
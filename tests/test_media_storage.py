@@ -0,0 +1,107 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from blog.images import get_variant_paths
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(color=(12, 34, 56)):
+    buffer = BytesIO()
+    Image.new('RGB', (50, 50), color=color).save(buffer, format='JPEG')
+    return ImageFile(buffer, name='same_photo.jpg')
+
+
+@pytest.fixture
+def posts_with_same_image(mixer):
+    return [
+        mixer.blend('blog.Post', is_published=True, image=make_image())
+        for _ in range(2)
+    ]
+
+
+def test_same_upload_is_stored_once(posts_with_same_image):
+    first, second = posts_with_same_image
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые фото хранятся одним файлом.'
+    )
+    assert first.image.storage.exists(first.image.name)
+
+
+def test_image_is_deleted_with_last_post(
+        posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    storage, name = first.image.storage, first.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert storage.exists(name), (
+        'Убедитесь, что фото не удаляется, пока на него ссылается другая'
+        ' публикация.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not storage.exists(name), (
+        'Убедитесь, что фото удаляется вместе с последней публикацией.'
+    )
+
+
+def test_replaced_image_is_deleted(
+        mixer, django_capture_on_commit_callbacks
+):
+    post = mixer.blend('blog.Post', image=make_image(color=(1, 2, 3)))
+    storage, name = post.image.storage, post.image.name
+    post.image = make_image(color=(4, 5, 6))
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert not storage.exists(name)
+    assert storage.exists(post.image.name)
+
+
+def test_content_addressed_media_is_immutable(
+        client, posts_with_same_image
+):
+    response = client.get(posts_with_same_image[0].image.url)
+    assert response.status_code == 200
+    assert 'immutable' in response['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени отдаются с заголовком'
+        ' `Cache-Control: immutable`.'
+    )
+
+
+def test_variants_are_deleted_with_last_post(
+        posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    first.refresh_from_db()
+    second.refresh_from_db()
+    storage = first.image.storage
+    paths = get_variant_paths(first.image_variants)
+    assert paths and all(storage.exists(path) for path in paths)
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert all(storage.exists(path) for path in paths), (
+        'Убедитесь, что копии фото не удаляются, пока фото использует'
+        ' другая публикация.'
+    )
+    with CaptureQueriesContext(connection) as context:
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+    assert not any(storage.exists(path) for path in paths)
+    reference_queries = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT "blog_post"."image"')
+    ]
+    assert reference_queries
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {reference_queries[0]}')
+        plan = [row[3] for row in cursor.fetchall()]
+    assert not any(step.startswith('SCAN blog_post') for step in plan), (
+        'Убедитесь, что ссылки на фото ищутся по индексу, без полного'
+        f' просмотра таблицы публикаций: {plan}'
+    )
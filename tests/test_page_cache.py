@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+import core.mixins
+from core.utils import get_visible_at
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        content = client.get(url).content.decode('utf-8')
+    return len(context.captured_queries), content
+
+
+def test_anonymous_page_is_cached(client, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+    ):
+        count_queries(client, url)
+        n_queries, content = count_queries(client, url)
+        assert n_queries == 0 and post.title in content, (
+            f"Убедитесь, что страница `{url}` для анонимного посетителя"
+            " отдаётся из кеша без запросов к базе данных."
+        )
+
+
+def test_logged_in_page_is_not_cached(
+        user_client, post_with_published_location
+):
+    count_queries(user_client, '/')
+    n_queries, _ = count_queries(user_client, '/')
+    assert n_queries > 0, (
+        "Убедитесь, что страницы авторизованных пользователей не кешируются."
+    )
+
+
+def test_anonymous_page_invalidation(
+        mixer: Mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    count_queries(client, '/')
+
+    mixer.blend('blog.Comment', post=post)
+    _, content = count_queries(client, '/')
+    assert 'Комментарии (1)' in content, (
+        "Убедитесь, что кеш страницы сбрасывается при добавлении комментария."
+    )
+
+    post.category.title = 'Новая категория'
+    post.category.save()
+    _, content = count_queries(client, f'/profile/{post.author.username}/')
+    assert 'Новая категория' in content, (
+        "Убедитесь, что кеш страницы сбрасывается при изменении категории."
+    )
+
+
+def test_page_cache_expires_with_scheduled_post(
+        mixer: Mixer, client, monkeypatch, post_with_published_location
+):
+    post = post_with_published_location
+    scheduled = mixer.blend(
+        'blog.Post',
+        author=post.author,
+        category=post.category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    timeouts = []
+    cache_set = core.mixins.cache.set
+
+    def spy_set(key, value, timeout=None, *args, **kwargs):
+        if key.startswith('feed_page:'):
+            timeouts.append(timeout)
+        return cache_set(key, value, timeout, *args, **kwargs)
+
+    monkeypatch.setattr(core.mixins.cache, 'set', spy_set)
+    client.get('/')
+    visible_in = get_visible_at(scheduled.pub_date) - timezone.now()
+    assert timeouts and timeouts[0] <= visible_in.total_seconds() + 1, (
+        "Убедитесь, что страница хранится в кеше не дольше, чем до выхода"
+        " следующей отложенной публикации."
+    )
+
+
+def test_page_cache_ignores_unrelated_params(
+        client, post_with_published_location
+):
+    count_queries(client, '/')
+    n_queries, _ = count_queries(client, '/?utm_source=mail&x=1')
+    assert n_queries == 0, (
+        "Убедитесь, что ключ кеша страницы учитывает только параметры"
+        " пагинации, а не любые параметры адреса."
+    )
+    n_queries, _ = count_queries(client, '/?page=1')
+    assert n_queries > 0
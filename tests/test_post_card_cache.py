@@ -0,0 +1,76 @@
+import pytest
+
+from blog.caching import post_card_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_card_stats(client, url='/'):
+    hits, misses = post_card_stats['hits'], post_card_stats['misses']
+    content = client.get(url).content.decode('utf-8')
+    return (
+        post_card_stats['hits'] - hits,
+        post_card_stats['misses'] - misses,
+        content,
+    )
+
+
+def test_post_card_is_cached(user_client, post_with_published_location):
+    assert get_card_stats(user_client)[:2] == (0, 1)
+    assert get_card_stats(user_client)[:2] == (1, 0), (
+        "Убедитесь, что карточка публикации берётся из кеша при повторном"
+        " показе ленты."
+    )
+
+
+def test_post_card_invalidation(
+        user_client, post_with_published_location, comment_to_a_post
+):
+    post = post_with_published_location
+    get_card_stats(user_client)
+
+    post.location.name = 'Новое место'
+    post.location.save()
+    hits, misses, content = get_card_stats(user_client)
+    assert misses == 1 and 'Новое место' in content, (
+        "Убедитесь, что карточка публикации сбрасывается при изменении"
+        " местоположения."
+    )
+
+    comment_to_a_post.delete()
+    hits, misses, content = get_card_stats(user_client)
+    assert misses == 1 and 'Комментарии (0)' in content, (
+        "Убедитесь, что карточка публикации сбрасывается при удалении"
+        " комментария."
+    )
+
+
+def test_category_edit_does_not_touch_posts(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.refresh_from_db()
+    updated_at = post.updated_at
+    get_card_stats(user_client)
+
+    post.category.title = 'Новая категория'
+    post.category.save()
+    hits, misses, content = get_card_stats(user_client)
+    assert misses == 1 and 'Новая категория' in content, (
+        "Убедитесь, что карточка публикации сбрасывается при изменении"
+        " категории."
+    )
+    post.refresh_from_db()
+    assert post.updated_at == updated_at, (
+        "Убедитесь, что изменение категории не переписывает время изменения"
+        " её публикаций."
+    )
+
+
+def test_author_rename_resets_card(user_client, user,
+                                   post_with_published_location):
+    get_card_stats(user_client)
+    user.username = 'renamed'
+    user.save()
+    hits, misses, content = get_card_stats(user_client)
+    assert misses == 1 and '@renamed' in content
@@ -0,0 +1,29 @@
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_detail_query_budget(
+        mixer: Mixer, client, django_assert_num_queries,
+        post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    with django_assert_num_queries(2):
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+
+
+def test_post_detail_query_budget_for_author(
+        mixer: Mixer, user_client, django_assert_num_queries,
+        unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    # Ещё два запроса — загрузка сессии и пользователя.
+    with django_assert_num_queries(4):
+        response = user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200, (
+        "Убедитесь, что автор видит свою неопубликованную публикацию."
+    )
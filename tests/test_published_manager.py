@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from core.utils import get_rounded_now
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(PUBLICATION_TIME_GRANULARITY=60)
+def test_rounded_now():
+    before = timezone.now()
+    now = get_rounded_now()
+    assert now <= before and before - now < timedelta(seconds=60), (
+        "Убедитесь, что текущее время округляется вниз: отложенные"
+        " публикации не должны появляться раньше срока."
+    )
+    assert now.timestamp() % 60 == 0, (
+        "Убедитесь, что текущее время округляется до заданного шага."
+    )
+
+
+def test_visible_at_uses_request_time(future_posts):
+    post = future_posts[0]
+    assert not Post.objects.published().filter(pk=post.pk).exists(), (
+        "Убедитесь, что отложенные публикации не видны до даты публикации."
+    )
+    later = post.pub_date + timedelta(seconds=1)
+    assert Post.objects.published(later).filter(pk=post.pk).exists(), (
+        "Убедитесь, что отложенная публикация становится видна после даты"
+        " публикации."
+    )
+
+
+def test_for_author(
+        user, another_user, unpublished_posts_with_published_locations
+):
+    post_ids = {post.pk for post in unpublished_posts_with_published_locations}
+    own = set(Post.objects.for_author(user).values_list('pk', flat=True))
+    assert post_ids <= own, (
+        "Убедитесь, что автор видит свои неопубликованные посты."
+    )
+    foreign = set(
+        Post.objects.for_author(another_user).values_list('pk', flat=True)
+    )
+    assert not post_ids & foreign, (
+        "Убедитесь, что неопубликованные посты не видны другим пользователям."
+    )
+
+
+def test_post_is_not_published_early(mixer, published_category, settings):
+    settings.PUBLICATION_TIME_GRANULARITY = 60
+    post = mixer.blend(
+        'blog.Post',
+        is_published=True,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert not Post.objects.published().filter(pk=post.pk).exists(), (
+        "Убедитесь, что отложенная публикация не показывается раньше"
+        " даты публикации."
+    )
+    assert Post.objects.scheduled().filter(pk=post.pk).exists(), (
+        "Убедитесь, что `scheduled()` использует ту же границу времени,"
+        " что и `published()`."
+    )
+
+
+def test_post_page_is_available_without_rounding(
+        client, mixer, published_category, settings
+):
+    settings.PUBLICATION_TIME_GRANULARITY = 60
+    post = mixer.blend(
+        'blog.Post',
+        is_published=True,
+        category=published_category,
+        location=None,
+        pub_date=timezone.now(),
+    )
+    response = client.get(f'/posts/{post.pk}/')
+    assert response.status_code == 200, (
+        "Убедитесь, что страница публикации доступна сразу после даты"
+        " публикации, даже если ленты округляют время."
+    )
@@ -0,0 +1,42 @@
+import pytest
+
+from core.middleware import QueryBudgetExceeded, QueryCounter
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_budget_exceeded_fails(settings, user_client):
+    settings.QUERY_BUDGETS = {'blog:index': 1}
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get('/')
+
+
+def test_budget_is_logged_only(settings, caplog, user_client):
+    settings.QUERY_BUDGETS = {'blog:index': 1}
+    settings.QUERY_BUDGET_RAISE = False
+    response = user_client.get('/')
+    assert response.status_code == 200
+    assert 'blog:index' in caplog.text, (
+        "Убедитесь, что превышение лимита запросов попадает в лог с именем"
+        " представления."
+    )
+
+
+def test_repeated_queries_are_detected():
+    counter = QueryCounter()
+
+    def execute(sql, params, many, context):
+        return None
+
+    for params in ((1,), (1, 2), (1, 2, 3)):
+        placeholders = ', '.join(['%s'] * len(params))
+        counter(
+            execute,
+            f'SELECT * FROM blog_post WHERE id IN ({placeholders})',
+            params, False, {},
+        )
+    counter(execute, 'SELECT * FROM blog_post WHERE id = %s', (1,), False, {})
+    assert counter.total == 4
+    assert counter.repeated(3) == [
+        ('SELECT * FROM blog_post WHERE id IN (%s, ...)', 3)
+    ], "Убедитесь, что одинаковые по форме запросы считаются вместе."
@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+INDEXED_TABLES = ('blog_post', 'blog_comment')
+
+
+def get_slow_steps(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = [row[3] for row in cursor.fetchall()]
+    return [
+        step for step in plan
+        if step.startswith('USE TEMP B-TREE FOR ORDER BY') or (
+            step.startswith('SCAN ')
+            and step.split()[1].strip('"') in INDEXED_TABLES
+        )
+    ]
+
+
+@pytest.fixture
+def seeded_blog():
+    call_command(
+        'seed_blog',
+        users=20,
+        categories=5,
+        locations=5,
+        posts=2000,
+        comments=2000,
+        stdout=io.StringIO(),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+@pytest.mark.parametrize('as_author', [False, True])
+def test_views_use_indexes(client, seeded_blog, as_author):
+    if connection.vendor != 'sqlite':
+        pytest.skip('EXPLAIN QUERY PLAN есть только в SQLite.')
+    post = Post.objects.published().select_related('author').first()
+    if as_author:
+        client.force_login(post.author)
+    category = Category.objects.filter(is_published=True).first()
+    urls = (
+        '/',
+        '/?page=5',
+        f'/category/{category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        for query in context.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            slow_steps = get_slow_steps(query['sql'])
+            assert not slow_steps, (
+                f"Убедитесь, что запросы страницы `{url}` используют индексы"
+                f" без полного просмотра таблиц и сортировки: {slow_steps}"
+                f"\n{query['sql']}"
+            )
@@ -0,0 +1,143 @@
+import sqlite3
+from contextlib import closing
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connections, router
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.bulk import delete_rows
+from blog.caching import INDEX_FEED, feed_count_key
+from blog.models import Comment, Post
+from core.management.commands.sync_replicas import copy_sqlite_database
+from core.routers import get_cache_timeout, read_from_replicas
+
+DATABASES = ['default', 'replica']
+
+pytestmark = [pytest.mark.django_db(databases=DATABASES)]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.READ_REPLICAS = ['replica']
+
+
+@pytest.fixture
+def post(mixer, published_category):
+    return mixer.blend(
+        'blog.Post',
+        is_published=True,
+        category=published_category,
+        location=None,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def count_queries(client, url, alias):
+    with CaptureQueriesContext(connections[alias]) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_router(replicas):
+    assert router.db_for_read(Post) == 'default'
+    with read_from_replicas():
+        assert router.db_for_read(Post) == 'replica'
+        assert router.db_for_write(Post) == 'default'
+    assert router.db_for_read(Post) == 'default'
+
+
+def test_replica_is_chosen_once_per_block(settings):
+    settings.READ_REPLICAS = ['replica', 'other']
+    for _ in range(5):
+        with read_from_replicas():
+            aliases = {router.db_for_read(Post) for _ in range(20)}
+        assert len(aliases) == 1, (
+            'Убедитесь, что все запросы одного обращения читают с одной'
+            ' и той же реплики.'
+        )
+
+
+def test_replica_cache_entries_are_short_lived(replicas, settings):
+    assert get_cache_timeout(300) == 300
+    with read_from_replicas():
+        assert get_cache_timeout(300) == settings.REPLICA_CACHE_TIMEOUT
+        assert get_cache_timeout(None) == settings.REPLICA_CACHE_TIMEOUT
+
+
+@pytest.mark.django_db(databases=['default'])
+def test_pinned_visitor_refreshes_shared_count(client, replicas, post,
+                                               settings):
+    cache.set(feed_count_key(INDEX_FEED), 99)
+    client.cookies[settings.REPLICA_PIN_COOKIE] = '1'
+    response = client.get('/')
+    assert response.context['paginator'].count == 1
+    assert cache.get(feed_count_key(INDEX_FEED)) == 1, (
+        'Убедитесь, что посетитель, недавно изменивший данные, пересчитывает'
+        ' общий счётчик по основной базе.'
+    )
+
+
+def test_router_without_replicas():
+    with read_from_replicas():
+        assert router.db_for_read(Post) == 'default'
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_feed_reads_from_replica(client, replicas, post):
+    response, queries = count_queries(client, '/', 'replica')
+    assert queries > 0, (
+        'Убедитесь, что лента при GET-запросе читает данные с реплики.'
+    )
+    assert list(response.context['page_obj']) == [post]
+
+
+@pytest.mark.django_db(databases=['default'])
+def test_write_pins_reads_to_primary(user_client, replicas, post, settings):
+    response = user_client.post(
+        f'/posts/{post.pk}/comment/', {'text': 'Комментарий'}
+    )
+    assert response.status_code == 302
+    cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+    assert cookie['max-age'] == settings.REPLICA_PIN_SECONDS, (
+        'Убедитесь, что после изменения данных посетитель на время '
+        'читает с основной базы.'
+    )
+    response, queries = count_queries(
+        user_client, f'/posts/{post.pk}/', 'default'
+    )
+    assert queries > 0
+    assert len(response.context['comments']) == 1
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_bulk_delete_writes_to_primary(replicas, mixer, post):
+    mixer.blend('blog.Comment', post=post)
+    with CaptureQueriesContext(connections['default']) as queries:
+        with read_from_replicas():
+            assert delete_rows(Comment.objects.all()) == 1
+    assert any(query['sql'].startswith('DELETE') for query in queries), (
+        'Убедитесь, что массовое удаление выполняется на основной базе.'
+    )
+
+
+def test_copy_sqlite_database(tmp_path):
+    source, target = tmp_path / 'source.sqlite3', tmp_path / 'target.sqlite3'
+    with closing(sqlite3.connect(source)) as db:
+        db.execute('CREATE TABLE post (title TEXT)')
+        db.execute("INSERT INTO post VALUES ('Первая')")
+        db.commit()
+    copy_sqlite_database(source, target)
+    with closing(sqlite3.connect(target)) as db:
+        assert db.execute('SELECT title FROM post').fetchall() == [
+            ('Первая',)
+        ]
+
+
+def test_sync_replicas_requires_replicas():
+    with pytest.raises(CommandError):
+        call_command('sync_replicas')
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import stem_text
+from core.models import Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, published_category):
+    def make(title='Заголовок', text='Текст', **kwargs):
+        fields = {
+            'is_published': True,
+            'category': published_category,
+            'pub_date': timezone.now() - timedelta(days=1),
+            **kwargs,
+        }
+        return mixer.blend('blog.Post', title=title, text=text, **fields)
+    return make
+
+
+def search(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return list(response.context['page_obj'])
+
+
+def test_stemming():
+    assert stem_text('Путешествия') == stem_text('путешествие')
+    assert stem_text('Ёлки') == stem_text('елка')
+
+
+def test_search_finds_word_forms(client, make_post):
+    post = make_post(title='Путешествия по горам')
+    make_post(title='Про море')
+    assert search(client, 'путешествие в горы') == [post], (
+        'Убедитесь, что поиск находит публикации по другим формам слов.'
+    )
+
+
+def test_search_ranks_title_above_text(client, make_post):
+    in_text = make_post(title='Заметка', text='Рецепт пирога с вишней')
+    in_title = make_post(title='Пирог', text='Простой рецепт')
+    assert search(client, 'пирог') == [in_title, in_text]
+
+
+def test_search_by_comments(client, make_post, mixer):
+    post = make_post()
+    comment = mixer.blend('blog.Comment', post=post, text='Отличный маршрут')
+    assert search(client, 'маршрут') == [post], (
+        'Убедитесь, что поиск учитывает текст комментариев.'
+    )
+    comment.delete()
+    assert search(client, 'маршрут') == []
+
+
+def test_new_comment_is_indexed_incrementally(
+        client, make_post, mixer, settings
+):
+    post = make_post()
+    mixer.cycle(3).blend('blog.Comment', post=post, text='Старый текст')
+    settings.TASK_BACKEND = 'database'
+    mixer.blend('blog.Comment', post=post, text='Живописное ущелье')
+    assert not Task.objects.filter(
+        name='blog.tasks.update_search_index'
+    ).exists(), (
+        'Убедитесь, что новый комментарий дописывается в поисковый индекс,'
+        ' а не перестраивает запись публикации целиком.'
+    )
+    assert search(client, 'ущелье') == [post]
+    assert search(client, 'старый') == [post]
+
+
+def test_search_respects_visibility(client, make_post):
+    make_post(title='Черновик', is_published=False)
+    make_post(
+        title='Черновик', pub_date=timezone.now() + timedelta(days=1)
+    )
+    assert search(client, 'черновик') == [], (
+        'Убедитесь, что поиск показывает только опубликованные посты.'
+    )
+
+
+def test_search_index_follows_changes(client, make_post):
+    post = make_post(title='Старое название')
+    post.title = 'Новое название'
+    post.save()
+    assert search(client, 'старое') == []
+    assert search(client, 'новое') == [post]
+    post.delete()
+    assert search(client, 'новое') == []
+
+
+def test_admin_search(admin_client, make_post):
+    make_post(title='Весенний сад', is_published=False)
+    response = admin_client.get('/admin/blog/post/', {'q': 'сады'})
+    assert response.status_code == 200
+    assert response.context['cl'].result_count == 1, (
+        'Убедитесь, что поиск в админке использует полнотекстовый индекс.'
+    )
@@ -0,0 +1,49 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def seed_blog(**options):
+    call_command(
+        'seed_blog',
+        users=5,
+        categories=3,
+        locations=2,
+        posts=40,
+        comments=100,
+        batch_size=7,
+        stdout=None,
+        **options,
+    )
+
+
+def test_seed_blog_creates_objects():
+    seed_blog(future_ratio=0.5, unpublished_ratio=0.5)
+    assert Post.objects.count() == 40
+    assert Comment.objects.count() == 100
+    assert Category.objects.count() == 3
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        'Убедитесь, что команда создаёт отложенные публикации.'
+    )
+    assert Post.objects.filter(is_published=False).exists(), (
+        'Убедитесь, что команда создаёт снятые с публикации посты.'
+    )
+    for post in Post.objects.all():
+        assert post.comment_count == post.comment.count(), (
+            'Убедитесь, что после наполнения базы у публикаций верное '
+            'количество комментариев.'
+        )
+
+
+def test_seed_blog_is_deterministic():
+    seed_blog(seed=1)
+    first = list(Post.objects.values_list('title', 'text', 'is_published'))
+    for model in (User, Category, Location):
+        model.objects.all().delete()
+    seed_blog(seed=1)
+    second = list(Post.objects.values_list('title', 'text', 'is_published'))
+    assert first == second
@@ -0,0 +1,47 @@
+import pytest
+
+from core.timing import get_percentile, timing_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_timing_stats():
+    timing_stats.clear()
+    yield
+    timing_stats.clear()
+
+
+def test_server_timing_header(client):
+    response = client.get('/')
+    header = response.get('Server-Timing', '')
+    for metric in ('db;dur=', 'render;dur=', 'total;dur='):
+        assert metric in header, (
+            'Убедитесь, что заголовок `Server-Timing` содержит время '
+            f'запросов к базе, отрисовки шаблона и всего запроса: {header}'
+        )
+
+
+def test_timings_are_aggregated_by_view(client, admin_client):
+    for _ in range(3):
+        client.get('/')
+    response = admin_client.get('/stats/timings/')
+    assert response.status_code == 200
+    stats = response.json()['blog:index']['total']
+    assert stats['count'] == 3
+    assert stats['p50'] <= stats['p95'] <= stats['p99']
+
+
+def test_timings_are_staff_only(user_client):
+    response = user_client.get('/stats/timings/')
+    assert response.status_code == 302, (
+        'Убедитесь, что статистика времени ответа доступна только '
+        'персоналу сайта.'
+    )
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 99) == 99
+    assert get_percentile([7], 95) == 7
@@ -0,0 +1,46 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.templatetags.static import static
+
+
+@pytest.fixture
+def static_dirs(settings, tmp_path):
+    source = tmp_path / 'source'
+    (source / 'css').mkdir(parents=True)
+    (source / 'img').mkdir()
+    (source / 'img' / 'logo.png').write_bytes(b'\x89PNG fake logo')
+    (source / 'css' / 'site.css').write_text(
+        'body { background: url("../img/logo.png"); }\n' * 50
+    )
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / 'root'
+    return tmp_path / 'root'
+
+
+def test_static_names_without_manifest(static_dirs):
+    assert static('css/site.css') == '/static/css/site.css', (
+        'Убедитесь, что без собранного манифеста статика доступна по'
+        ' исходным именам.'
+    )
+
+
+def test_collectstatic_hashes_and_compresses(static_dirs):
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+    url = static('css/site.css')
+    assert url != '/static/css/site.css', (
+        'Убедитесь, что после collectstatic имена статики содержат хеш.'
+    )
+    hashed = static_dirs / url.removeprefix('/static/')
+    compressed = hashed.with_name(hashed.name + '.gz')
+    assert compressed.exists(), (
+        'Убедитесь, что collectstatic создаёт сжатые копии текстовых'
+        ' файлов.'
+    )
+    assert gzip.decompress(compressed.read_bytes()) == hashed.read_bytes()
+    assert 'logo.' in hashed.read_text() and 'logo.png' not in (
+        hashed.read_text()
+    )
+    assert static('img/missing.png') == '/static/img/missing.png'
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import ImageStatus
+from core.models import Task
+from core.tasks import claim_task, run_pending_tasks
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def database_backend(settings):
+    settings.TASK_BACKEND = 'database'
+
+
+def make_post(mixer, content):
+    post = mixer.blend(
+        'blog.Post',
+        is_published=True,
+        image=ImageFile(BytesIO(content), name='queued_image.jpg'),
+    )
+    Task.objects.exclude(name='blog.tasks.process_post_image').delete()
+    return post
+
+
+def jpeg_bytes():
+    buffer = BytesIO()
+    Image.new('RGB', (800, 600), color=(73, 109, 137)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def test_image_is_processed_by_worker(database_backend, mixer):
+    post = make_post(mixer, jpeg_bytes())
+    post.refresh_from_db()
+    assert post.image_status == ImageStatus.PENDING
+    assert post.image_variants == {}, (
+        'Убедитесь, что при фоновой обработке копии фото не строятся во'
+        ' время запроса.'
+    )
+    assert Task.objects.count() == 1
+
+    call_command('run_tasks', once=True, stdout=None)
+    post.refresh_from_db()
+    assert post.image_status == ImageStatus.READY
+    assert post.image_variants['source'] == post.image.name
+    assert not Task.objects.exists()
+
+
+def test_failed_task_is_retried(database_backend, mixer):
+    post = make_post(mixer, b'not an image')
+    assert run_pending_tasks() == 1
+    task = Task.objects.get()
+    assert task.status == Task.Status.PENDING
+    assert task.attempts == 1
+    assert task.run_after > timezone.now()
+    assert task.last_error, 'Убедитесь, что текст ошибки задачи сохраняется.'
+
+    for _ in range(task.max_attempts - 1):
+        Task.objects.update(run_after=timezone.now())
+        run_pending_tasks()
+    task.refresh_from_db()
+    post.refresh_from_db()
+    assert task.status == Task.Status.FAILED
+    assert post.image_status == ImageStatus.FAILED, (
+        'Убедитесь, что после всех неудачных попыток у публикации'
+        ' отмечается ошибка обработки фото.'
+    )
+
+
+def test_stale_task_is_reclaimed(settings, database_backend, mixer):
+    make_post(mixer, jpeg_bytes())
+    task = claim_task()
+    assert claim_task() is None, (
+        'Убедитесь, что одну задачу не могут взять два воркера.'
+    )
+    Task.objects.update(
+        locked_at=timezone.now() - timedelta(seconds=settings.TASK_TIMEOUT + 1)
+    )
+    assert claim_task().pk == task.pk
+
+
+def test_unique_task_is_queued_once(database_backend, mixer):
+    post = mixer.blend('blog.Post')
+    Task.objects.all().delete()
+    for _ in range(3):
+        mixer.blend('blog.Comment', post=post)
+    assert Task.objects.filter(
+        name='blog.tasks.update_search_index'
+    ).count() == 1, (
+        'Убедитесь, что переиндексация публикации не ставится в очередь'
+        ' повторно, пока там ждёт такая же задача.'
+    )
@@ -0,0 +1,77 @@
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_upload(size=(100, 100), image_format='PNG', content=None):
+    if content is None:
+        buffer = BytesIO()
+        Image.new('RGB', size, color=(73, 109, 137)).save(
+            buffer, format=image_format
+        )
+        content = buffer.getvalue()
+    return SimpleUploadedFile('upload.png', content, 'image/png')
+
+
+def png_chunk(chunk_type, data):
+    chunk = chunk_type + data
+    return (
+        struct.pack('>I', len(data)) + chunk
+        + struct.pack('>I', zlib.crc32(chunk))
+    )
+
+
+def make_png_header(width, height):
+    """Начало PNG-файла, заявляющего указанные размеры."""
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(
+        b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    ) + png_chunk(b'IDAT', b'')
+
+
+def create_post(client, category, image):
+    return client.post('/posts/create/', {
+        'title': 'Публикация с фото',
+        'text': 'Текст',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': category.pk,
+        'image': image,
+    })
+
+
+def test_valid_image_is_accepted(user_client, published_category):
+    response = create_post(user_client, published_category, make_upload())
+    assert response.status_code == 302
+    assert Post.objects.exclude(image='').exists()
+    assert 'upload;dur=' in response['Server-Timing'], (
+        'Убедитесь, что время загрузки файла попадает в `Server-Timing`.'
+    )
+
+
+@pytest.mark.parametrize('setting, value, upload', [
+    ('MAX_UPLOAD_SIZE', 1024, lambda: make_upload(size=(500, 500))),
+    ('MAX_IMAGE_PIXELS', 100, lambda: make_upload()),
+    ('IMAGE_UPLOAD_FORMATS', ('JPEG',), lambda: make_upload()),
+    (None, None, lambda: make_upload(content=b'plain text, not a picture')),
+    (None, None, lambda: make_upload(content=make_png_header(30000, 30000))),
+])
+def test_invalid_upload_is_rejected(
+        settings, user_client, published_category, setting, value, upload
+):
+    if setting:
+        setattr(settings, setting, value)
+    response = create_post(user_client, published_category, upload())
+    assert response.status_code == 200
+    assert response.context['form'].errors.get('image'), (
+        'Убедитесь, что слишком большие файлы и не картинки отклоняются'
+        ' с ошибкой в поле `image`.'
+    )
+    assert not Post.objects.exists()